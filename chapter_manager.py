@@ -9,7 +9,7 @@ import json
 from typing import Dict, List, Optional
 from pathlib import Path
 from llmrag.ingestion.ingest_html import ingest_html_file
-from llmrag.embeddings import SentenceTransformersEmbedder
+from llmrag.embeddings.sentence_transformers_embedder import SentenceTransformersEmbedder
 from llmrag.retrievers import ChromaVectorStore
 from llmrag.models.fake_llm import FakeLLM
 from llmrag.pipelines.rag_pipeline import RAGPipeline
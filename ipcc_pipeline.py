@@ -115,14 +115,17 @@ class IPCCPipeline:
         # Stage 2: Clean
         if self.pipeline_config['stages']['clean']['enabled']:
             self.logger.info(f"Cleaning content for {source['name']}")
-            cleaned_content = self.cleaner.clean(html_content)
+            cleaned_tree = self.cleaner.clean_tree(html_content)
+            cleaned_content = self.cleaner.serialize(cleaned_tree)
             cleaned_path = source_dir / "cleaned.html"
             cleaned_path.write_text(cleaned_content, encoding='utf-8')
         
         # Stage 3: Structure (add paragraph IDs)
         if self.pipeline_config['stages']['structure']['enabled']:
             self.logger.info(f"Adding structure and IDs to {source['name']}")
-            structured_content = self.structurer.structure(cleaned_content)
+            # Annotate the cleaned tree in place rather than re-parsing the serialized HTML
+            structured_tree = self.structurer.structure_tree(cleaned_tree)
+            structured_content = self.structurer.serialize(structured_tree)
             structured_path = source_dir / "structured.html"
             structured_path.write_text(structured_content, encoding='utf-8')
         
@@ -2,14 +2,7 @@
 LLMRAG - Local RAG pipeline with chunking, embedding, and retrieval
 """
 
-# Import the main chapter RAG functionality
-from .chapter_rag import ChapterRAG, load_chapter, ask_chapter, list_available_chapters
-
-# Import other key components
-from .chunking.html_splitter import HtmlTextSplitter
-from .embeddings.sentence_transformers_embedder import SentenceTransformersEmbedder
-from .models.fake_llm import FakeLLM
-from .pipelines.rag_pipeline import RAGPipeline
+import importlib
 
 __all__ = [
     'ChapterRAG',
@@ -21,3 +14,24 @@ __all__ = [
     'FakeLLM',
     'RAGPipeline'
 ]
+
+# Where each public name lives. Most of these pull in torch/transformers, so they
+# are imported on first use: `import llmrag.utils...` stays cheap.
+_LAZY_IMPORTS = {
+    'ChapterRAG': '.chapter_rag',
+    'load_chapter': '.chapter_rag',
+    'ask_chapter': '.chapter_rag',
+    'list_available_chapters': '.chapter_rag',
+    'HtmlTextSplitter': '.chunking.html_splitter',
+    'SentenceTransformersEmbedder': '.embeddings.sentence_transformers_embedder',
+    'FakeLLM': '.models.fake_llm',
+    'RAGPipeline': '.pipelines.rag_pipeline',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -24,13 +24,14 @@ Key Concepts:
 
 import os
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path  # Modern way to work with file paths in Python
-from lxml import html  # For parsing HTML to extract titles
+from lxml import etree  # For parsing HTML to extract titles
 
 # Import our custom components
 from llmrag.ingestion.ingest_html import ingest_html_file  # Loads HTML files into the system
-from llmrag.embeddings import SentenceTransformersEmbedder  # Converts text to vectors
+from llmrag.embeddings.sentence_transformers_embedder import SentenceTransformersEmbedder  # Converts text to vectors
 from llmrag.retrievers import ChromaVectorStore  # Database for storing and searching documents
 from llmrag.models.transformers_model import TransformersModel  # Language model for generating answers
 from llmrag.pipelines.rag_pipeline import RAGPipeline  # Orchestrates the whole process
@@ -152,6 +153,19 @@ def sort_chapters_bibliographically(chapters_with_titles: List[Tuple[str, str]])
     return [(original_path, title) for _, title, _, _, original_path in normalized_chapters]
 
 
+@lru_cache(maxsize=None)
+def get_shared_embedder() -> SentenceTransformersEmbedder:
+    """
+    Get the process-wide embedder, loading it on first use.
+    
+    STUDENT NOTE:
+    The embedder turns chapter text into vectors. It does not depend on which
+    language model answers the questions, so a gpt2-medium and a gpt2-large
+    ChapterRAG can share one copy, and the chapters they index are identical.
+    """
+    return SentenceTransformersEmbedder()
+
+
 class ChapterRAG:
     """
     Simple RAG system for IPCC chapters.
@@ -197,6 +211,10 @@ class ChapterRAG:
         self.pipelines: Dict[str, RAGPipeline] = {}  # Store RAG pipelines for each user+chapter combination
         self.model_name = model_name
         
+        # Heavy models are created on first use and shared by every chapter/user pipeline
+        self._embedder = None
+        self._llm = None
+        
         # Auto-detect best device with robust fallback
         if device == "auto":
             self.device = self._get_safe_device()
@@ -230,6 +248,26 @@ class ChapterRAG:
             print(f"⚠️  Device detection failed: {e}, defaulting to CPU")
             return "cpu"
         
+    def _get_embedder(self) -> SentenceTransformersEmbedder:
+        """
+        Get the shared embedder, loading it on first use.
+        """
+        if self._embedder is None:
+            self._embedder = get_shared_embedder()
+        return self._embedder
+    
+    def _get_llm(self) -> TransformersModel:
+        """
+        Get the shared language model, loading its weights on first use.
+        
+        STUDENT NOTE:
+        Loading gpt2-large means reading gigabytes of weights. Every chapter and
+        user of this ChapterRAG asks the same model, so it is loaded only once.
+        """
+        if self._llm is None:
+            self._llm = TransformersModel(model_name=self.model_name, device=self.device)
+        return self._llm
+    
     def _extract_chapter_title(self, html_file_path: Path) -> str:
         """
         Extract the title from an HTML file.
@@ -249,33 +287,36 @@ class ChapterRAG:
             The extracted title or a default title
         """
         try:
-            # Read the HTML file
-            with open(html_file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # Parse the HTML
-            tree = html.fromstring(html_content)
-            
-            # Try to find title in <title> tag first
-            title_elements = tree.xpath('//title')
-            if title_elements:
-                title = title_elements[0].text_content().strip()
-                if title:
-                    return title
-            
-            # Try to find title in <h1> tag
-            h1_elements = tree.xpath('//h1')
-            if h1_elements:
-                title = h1_elements[0].text_content().strip()
-                if title:
-                    return title
+            # Stream through the file instead of building the whole page in memory.
+            # The <title> sits in the <head>, so we can usually stop right there.
+            # Otherwise every element we are done with is cleared as we go, so
+            # memory stays small even when the whole page has to be read.
+            first_texts = {}  # tag -> text of the first element with that tag
+            capturing = None  # first title/h1/h2 whose text is still being read
+            for event, element in etree.iterparse(str(html_file_path), events=('start', 'end'),
+                                                  html=True, encoding='utf-8'):
+                tag = element.tag
+                if event == 'start':
+                    if capturing is None and tag in ('title', 'h1', 'h2') and tag not in first_texts:
+                        capturing = element
+                    continue
+                
+                if element is capturing:
+                    first_texts[tag] = ''.join(element.itertext()).strip()
+                    capturing = None
+                    if tag == 'title' and first_texts[tag]:
+                        return first_texts[tag]
+                
+                if capturing is None:
+                    # Free this element and the finished siblings before it
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
             
-            # Try to find title in <h2> tag
-            h2_elements = tree.xpath('//h2')
-            if h2_elements:
-                title = h2_elements[0].text_content().strip()
-                if title:
-                    return title
+            # No usable <title>: try the first <h1>, then the first <h2>
+            for tag in ('title', 'h1', 'h2'):
+                if first_texts.get(tag):
+                    return first_texts[tag]
             
             # Fallback: use filename as title
             return html_file_path.stem.replace('_', ' ').title()
@@ -352,13 +393,13 @@ class ChapterRAG:
         
         # Ingest the chapter with caching - this processes the HTML and stores it in the vector database
         # The improved ingestion will check if the collection already exists and skip if it does
-        ingest_html_file(str(html_file), collection_name=collection_name, force_reingest=False)
+        ingest_html_file(str(html_file), collection_name=collection_name, force_reingest=False, embedder=self._get_embedder())
         
         # Create pipeline with real model
         # This sets up all the components needed to answer questions
-        embedder = SentenceTransformersEmbedder()  # Converts text to vectors
+        embedder = self._get_embedder()  # Converts text to vectors (shared)
         retriever = ChromaVectorStore(embedder=embedder, collection_name=collection_name)  # Database for searching
-        llm = TransformersModel(model_name=self.model_name, device=self.device)  # AI model for generating answers
+        llm = self._get_llm()  # AI model for generating answers (shared)
         pipeline = RAGPipeline(vector_store=retriever, model=llm)  # Orchestrates everything
         
         # Store pipeline for this user+chapter combination
@@ -412,6 +453,88 @@ class ChapterRAG:
         
         return result
     
+    def ask_stream(self, question: str, chapter_name: str, user_id: str = "default") -> Dict:
+        """
+        Ask a question, streaming the answer as it is generated.
+        
+        STUDENT EXPLANATION:
+        Works like ask(), but instead of waiting for the full answer it returns
+        an iterator of text pieces under "answer_stream". A web UI can display
+        the words as they arrive. The sources are known before generation
+        starts, so "context" and "paragraph_ids" are filled in right away.
+        
+        Args:
+            question: The question to ask
+            chapter_name: Chapter name (e.g., "wg1/chapter04")
+            user_id: User identifier
+            
+        Returns:
+            Dictionary with answer_stream, context, and paragraph IDs
+        """
+        key = f"{chapter_name}_{user_id}"
+        
+        if key not in self.pipelines:
+            self.load_chapter(chapter_name, user_id)
+        
+        result = self.pipelines[key].stream(question)
+        result["chapter"] = chapter_name
+        result["user_id"] = user_id
+        
+        return result
+    
+    def embed_query(self, text: str, chapter_name: str, user_id: str = "default") -> List[float]:
+        """
+        Embed text with the same embedder the chapter's pipeline searches with.
+        
+        Useful for comparing questions with each other, e.g. to spot a repeated
+        question before running the whole pipeline again.
+        
+        Args:
+            text: The text to embed
+            chapter_name: Chapter name (e.g., "wg1/chapter04")
+            user_id: User identifier
+            
+        Returns:
+            The embedding vector
+        """
+        key = f"{chapter_name}_{user_id}"
+        
+        if key not in self.pipelines:
+            self.load_chapter(chapter_name, user_id)
+        
+        return self.pipelines[key].vector_store.embedder.embed_query(text)
+    
+    def ask_batch(self, questions: List[str], chapter_name: str, user_id: str = "default") -> List[Dict]:
+        """
+        Ask several questions about a chapter in one go.
+        
+        STUDENT EXPLANATION:
+        Each question gets its own search for context, but the AI model answers
+        them all together in a single batch. That is faster than asking them one
+        after another, because the model does the same work for all of them at
+        each step.
+        
+        Args:
+            questions: The questions to ask
+            chapter_name: Chapter name (e.g., "wg1/chapter04")
+            user_id: User identifier
+            
+        Returns:
+            List of dictionaries (one per question, in order) with answer,
+            context, and paragraph IDs
+        """
+        key = f"{chapter_name}_{user_id}"
+        
+        if key not in self.pipelines:
+            self.load_chapter(chapter_name, user_id)
+        
+        results = self.pipelines[key].run_batch(questions)
+        for result in results:
+            result["chapter"] = chapter_name
+            result["user_id"] = user_id
+        
+        return results
+    
     def list_chapters(self) -> List[str]:
         """
         List available chapters.
@@ -19,9 +19,13 @@ Key Concepts:
 """
 
 from typing import List  # Python type hints - helps catch errors early
-from lxml import html    # Library for parsing HTML (like reading a web page)
+from lxml import etree, html  # Library for parsing HTML (like reading a web page)
 from langchain_core.documents import Document  # Standard format for RAG documents
 
+# All headings (h1-h6) and paragraphs (p), in document order.
+# Compiled once here instead of every time split() runs.
+HEADINGS_AND_PARAGRAPHS = etree.XPath('//h1 | //h2 | //h3 | //h4 | //h5 | //h6 | //p')
+
 
 class HtmlTextSplitter:
     """
@@ -99,11 +103,25 @@ class HtmlTextSplitter:
             ['p1']
         """
         # Parse the HTML string into a tree structure we can navigate
-        tree = html.fromstring(html_content)
-        
+        return self.split_tree(html.fromstring(html_content))
+
+    def split_tree(self, tree) -> List[Document]:
+        """
+        Split an already-parsed HTML tree into chunks, exactly like split().
+
+        STUDENT NOTE:
+        Parsing is the first step of split(). If you already have the tree
+        (e.g. from lxml.html.fromstring), pass it here and skip parsing again.
+
+        Args:
+            tree: An lxml element, e.g. the result of lxml.html.fromstring().
+
+        Returns:
+            List[Document]: Same chunks as split() returns for the source HTML.
+        """
         # Find all headings (h1-h6) and paragraphs (p) in the HTML
         # This uses XPath, which is like a query language for HTML
-        elements = tree.xpath('//h1 | //h2 | //h3 | //h4 | //h5 | //h6 | //p')
+        elements = HEADINGS_AND_PARAGRAPHS(tree)
 
         # Initialize variables to build our chunks
         chunks = []  # Will hold all our final chunks
@@ -4,17 +4,11 @@ def split_documents(text, chunk_size=100, overlap=20, metadata=None):
     if overlap >= chunk_size:
         raise ValueError("`overlap` must be smaller than `chunk_size` to avoid infinite loops.")
 
-    chunks = []
-    start = 0
-    chunk_index = 0
-
-    while start < len(text):
-        end = min(start + chunk_size, len(text))
-        chunk_text = text[start:end]
-        chunk_metadata = dict(metadata or {})
-        chunk_metadata["chunk_index"] = chunk_index
-        chunks.append(Document(page_content=chunk_text, metadata=chunk_metadata))
-        chunk_index += 1
-        start += chunk_size - overlap  # safe slide
-
-    return chunks
+    metadata = metadata or {}
+    step = chunk_size - overlap  # safe slide
+
+    # Window starts come straight from range(); slicing past the end clamps by itself
+    return [
+        Document(page_content=text[start:start + chunk_size], metadata={**metadata, "chunk_index": chunk_index})
+        for chunk_index, start in enumerate(range(0, len(text), step))
+    ]
@@ -1,7 +1,24 @@
-from llmrag.embeddings.sentence_transformers_embedder import SentenceTransformersEmbedder
+import os
+
+from llmrag.embeddings.hash_embedder import HashEmbedder
+
+__all__ = ['HashEmbedder', 'load_embedder']
 
 def load_embedder(config):
-    return SentenceTransformersEmbedder(
-        model_name=config.get("model_name", "all-MiniLM-L6-v2"),
-        device=config.get("device", "cpu")
-    )
+    # LLMRAG_EMBEDDER=onnx switches every load_embedder() caller (e.g. the test suite) to ONNX Runtime
+    backend = config.get("backend") or os.environ.get("LLMRAG_EMBEDDER", "sentence_transformers")
+    model_name = config.get("model_name", "all-MiniLM-L6-v2")
+    # Backends are imported on demand so the ONNX path never loads torch/sentence_transformers
+    if backend == "onnx":
+        from llmrag.embeddings.onnx_embedder import OnnxEmbedder
+        if model_name != OnnxEmbedder.MODEL_NAME:
+            raise ValueError(f"ONNX embedder only supports {OnnxEmbedder.MODEL_NAME}, not {model_name}")
+        return OnnxEmbedder()
+    elif backend == "sentence_transformers":
+        from llmrag.embeddings.sentence_transformers_embedder import SentenceTransformersEmbedder
+        return SentenceTransformersEmbedder(
+            model_name=model_name,
+            device=config.get("device", "cpu")
+        )
+    else:
+        raise ValueError(f"Unknown embedder backend: {backend}")
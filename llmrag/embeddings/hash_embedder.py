@@ -0,0 +1,49 @@
+import hashlib
+from typing import List
+import numpy as np
+from langchain_core.documents import Document
+from llmrag.embeddings.base_embedder import BaseEmbedder
+
+class HashEmbedder(BaseEmbedder):
+    """
+    Deterministic stand-in embedder for tests that need vectors but not meaning.
+
+    Each text is hashed with BLAKE2b and the digest seeds a random unit vector,
+    so the same text always maps to the same vector and nothing (torch, model
+    weights) has to be loaded. Similar texts do NOT get similar vectors; use a
+    real embedder wherever retrieval quality is asserted.
+
+    Args:
+        dim (int): Embedding dimension. Defaults to 384, like all-MiniLM-L6-v2.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts (a single vector if `texts` is one string).
+        """
+        if isinstance(texts, str):
+            return self._vector(texts).tolist()
+        return self.embed_many(texts).tolist()
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a single query string."""
+        return self._vector(query).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed multiple documents."""
+        return self.embed(texts)
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts into a float32 array of shape (len(texts), dim)."""
+        texts = [text.page_content if isinstance(text, Document) else text for text in texts]
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.stack([self._vector(text) for text in texts])
@@ -0,0 +1,88 @@
+from typing import List
+import numpy as np
+from langchain_core.documents import Document
+from llmrag.embeddings.base_embedder import BaseEmbedder
+
+class OnnxEmbedder(BaseEmbedder):
+    """
+    Embedding model running all-MiniLM-L6-v2 through ONNX Runtime.
+
+    Uses the ONNX export that ChromaDB ships as its default embedding function,
+    so it needs no dependency beyond chromadb and loads without torch. Its
+    vectors are the ones Chroma computes for text queries.
+
+    Args:
+        providers (List[str], optional): ONNX Runtime execution providers.
+            Defaults to ["CPUExecutionProvider"].
+
+    Methods:
+        embed(texts: List[str]) -> List[List[float]]:
+            Embed a batch of texts.
+        embed_query(query: str) -> List[float]:
+            Embed a single query.
+        embed_documents(texts: List[str]) -> List[List[float]]:
+            Embed multiple documents.
+        embed_many(texts: List[str]) -> np.ndarray:
+            Embed a batch of texts into a 2-D float32 array.
+    """
+
+    MODEL_NAME = "all-MiniLM-L6-v2"
+
+    def __init__(self, providers=None):
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+        self.model = ONNXMiniLM_L6_V2(preferred_providers=providers or ["CPUExecutionProvider"])
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            List[List[float]]: Embeddings for each text (a single vector if
+            `texts` is one string, like SentenceTransformer.encode).
+        """
+        if isinstance(texts, str):
+            return self.model([texts])[0].tolist()
+        if not texts:
+            return []
+        if isinstance(texts[0], Document):
+            texts = [doc.page_content for doc in texts]
+        return [embedding.tolist() for embedding in self.model(list(texts))]
+
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a single query string.
+
+        Args:
+            query (str): The query to embed.
+
+        Returns:
+            List[float]: The embedding vector.
+        """
+        return self.embed([query])[0]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed multiple documents.
+
+        Args:
+            texts (List[str]): The documents to embed.
+
+        Returns:
+            List[List[float]]: List of embedding vectors.
+        """
+        return self.embed(texts)
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts into one array, skipping the conversion to Python lists.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(texts), dim).
+        """
+        return np.stack(self.model(list(texts))).astype(np.float32, copy=False)
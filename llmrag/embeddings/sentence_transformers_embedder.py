@@ -1,4 +1,6 @@
+from functools import lru_cache
 from typing import List
+import numpy as np
 from langchain_core.documents import Document
 from llmrag.embeddings.base_embedder import BaseEmbedder
 from sentence_transformers import SentenceTransformer
@@ -18,10 +20,17 @@ sentence_transformer
             Embed a single query.
         embed_documents(texts: List[str]) -> List[List[float]]:
             Embed multiple documents.
+        embed_many(texts: List[str]) -> np.ndarray:
+            Embed a batch of texts into a 2-D float32 array.
     """
 
+    # Number of recent query embeddings kept per embedder
+    QUERY_CACHE_SIZE = 1024
+
     def __init__(self, model_name="all-MiniLM-L6-v2", device="cpu"):
         self.model = SentenceTransformer(model_name, device=device)
+        # Repeated questions skip the forward pass; kept per instance so it dies with the model
+        self._encode_query = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._encode_query_uncached)
 
     def embed(self, texts: List[str]) -> List[List[float]]:
         """
@@ -57,7 +66,11 @@ sentence_transformer
         Returns:
             List[float]: The embedding vector.
         """
-        return self.model.encode(query, convert_to_numpy=True).tolist()
+        # Copy so callers cannot change the cached vector
+        return list(self._encode_query(query))
+
+    def _encode_query_uncached(self, query: str) -> tuple:
+        return tuple(self.model.encode(query, convert_to_numpy=True).tolist())
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
@@ -79,3 +92,17 @@ sentence_transformer
             print(f"[Embed] Completed embedding generation")
         
         return embeddings
+
+    def embed_many(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Embed a batch of texts into one array, skipping the conversion to Python lists.
+
+        Args:
+            texts (List[str]): The texts to embed.
+            batch_size (int): Number of texts per forward pass.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(texts), dim).
+        """
+        return self.model.encode(list(texts), batch_size=batch_size, show_progress_bar=False,
+                                 convert_to_numpy=True).astype(np.float32, copy=False)
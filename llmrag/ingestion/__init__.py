@@ -1,3 +1,3 @@
-from llmrag.ingestion.ingest_html import ingest_html_file
+from llmrag.ingestion.ingest_html import ingest_html_file, ingest_html_tree
 
-__all__ = ['ingest_html_file']
+__all__ = ['ingest_html_file', 'ingest_html_tree']
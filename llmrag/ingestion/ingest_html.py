@@ -1,11 +1,28 @@
+import hashlib
+import mmap
 import os
+from lxml import html
 from llmrag.chunking.html_splitter import HtmlTextSplitter
 from llmrag.embeddings.sentence_transformers_embedder import SentenceTransformersEmbedder
-from llmrag.retrievers.chroma_store import ChromaVectorStore
-import chromadb
-from chromadb.config import Settings
+from llmrag.retrievers.chroma_store import DEFAULT_CHROMA_PATH, ChromaVectorStore, get_chroma_client
 
-def ingest_html_file(file_path: str, collection_name: str = "html_docs", chunk_size: int = 500, force_reingest: bool = False):
+def compute_file_hash(file_path: str) -> str:
+    """
+    Returns a BLAKE2b hex digest of the file contents, used to tag ingested chunks.
+
+    The file is hashed through a read-only memory map rather than read into a
+    bytes object, since this runs on every load, including cache hits.
+    """
+    with open(file_path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.blake2b(mm).hexdigest()
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            return hashlib.blake2b(b"").hexdigest()
+
+
+def ingest_html_file(file_path: str, collection_name: str = "html_docs", chunk_size: int = 500, force_reingest: bool = False, embedder=None, persist_path=None):
     """
     Ingests an HTML file into a Chroma vector store with caching support.
 
@@ -13,22 +30,25 @@ def ingest_html_file(file_path: str, collection_name: str = "html_docs", chunk_s
         file_path (str): Path to the HTML file.
         collection_name (str): Name of the Chroma collection.
         chunk_size (int): Character size of each chunk.
-        force_reingest (bool): Force re-ingestion even if collection exists.
+        force_reingest (bool): Re-ingest this file even if the collection already holds it.
+        embedder: Optional already-loaded embedder to reuse; a SentenceTransformersEmbedder
+            is created if omitted.
+        persist_path (str, optional): Chroma directory to use instead of ./chroma_db.
     """
     if not os.path.isfile(file_path):
         raise FileNotFoundError(f"HTML file not found: {file_path}")
 
-    # Check if collection already exists and has data
+    source = os.path.abspath(file_path)
+    source_hash = compute_file_hash(file_path)
+    client = get_chroma_client(str(persist_path or DEFAULT_CHROMA_PATH))
+
+    # Check if collection already holds chunks of this exact file
     if not force_reingest:
         try:
-            client = chromadb.PersistentClient(
-                path="./chroma_db",
-                settings=Settings(anonymized_telemetry=False)
-            )
             collection = client.get_collection(collection_name)
-            count = collection.count()
-            if count > 0:
-                print(f"[Cache] Found existing collection '{collection_name}' with {count} documents. Skipping ingestion.")
+            cached = collection.get(where={"$and": [{"source": source}, {"source_hash": source_hash}]}, limit=1)
+            if cached["ids"]:
+                print(f"[Cache] Collection '{collection_name}' already holds {file_path}. Skipping ingestion.")
                 return
         except Exception:
             # Collection doesn't exist, proceed with ingestion
@@ -38,33 +58,80 @@ def ingest_html_file(file_path: str, collection_name: str = "html_docs", chunk_s
     with open(file_path, "r", encoding="utf-8") as f:
         html_content = f.read()
 
+    ingest_html_tree(html.fromstring(html_content), collection_name=collection_name, chunk_size=chunk_size,
+                     embedder=embedder, persist_path=persist_path, source=source, source_hash=source_hash)
+
+
+def ingest_html_tree(tree, collection_name: str = "html_docs", chunk_size: int = 500, embedder=None,
+                     persist_path=None, source: str = None, source_hash: str = None):
+    """
+    Ingests an already-parsed HTML tree into a Chroma vector store.
+
+    Replaces any chunks already stored for `source`; other sources in the collection
+    are left alone. Without a source the chunks are added to what is already there.
+    The file-hash cache check lives in ingest_html_file().
+
+    Args:
+        tree: An lxml element, e.g. lxml.html.fromstring(html_content).
+        collection_name (str): Name of the Chroma collection.
+        chunk_size (int): Character size of each chunk.
+        embedder: Optional already-loaded embedder to reuse; a SentenceTransformersEmbedder
+            is created if omitted.
+        persist_path (str, optional): Chroma directory to use instead of ./chroma_db.
+        source (str, optional): Source path stored on every chunk, e.g. the HTML file's path.
+        source_hash (str, optional): Hash stored on every chunk so ingest_html_file() can
+            recognise the source next time.
+
+    Returns:
+        int: Number of chunks stored.
+    """
     # Step 1: Chunk HTML into text segments
     print(f"[Ingest] Splitting HTML into chunks (size: {chunk_size} chars)...")
     splitter = HtmlTextSplitter(chunk_size=chunk_size)
-    chunks = splitter.split(html_content)
+    chunks = splitter.split_tree(tree)
     if not chunks:
         raise ValueError("No content extracted from the HTML file.")
 
-    print(f"[Ingest] Extracted {len(chunks)} chunks from {file_path}")
+    print(f"[Ingest] Extracted {len(chunks)} chunks")
+
+    # Tag every chunk so later runs can detect that this file is already ingested
+    for chunk in chunks:
+        if source:
+            chunk.metadata["source"] = source
+        if source_hash:
+            chunk.metadata["source_hash"] = source_hash
 
     # Step 2: Embed chunks with progress tracking
     print(f"[Ingest] Generating embeddings for {len(chunks)} chunks...")
-    embedder = SentenceTransformersEmbedder()
+    if embedder is None:
+        embedder = SentenceTransformersEmbedder()
     
     # Process embeddings in batches for better progress tracking
     batch_size = 50
     all_embeddings = []
     for i in range(0, len(chunks), batch_size):
         batch = chunks[i:i + batch_size]
-        batch_embeddings = embedder.embed(batch)
+        if hasattr(embedder, "embed_many"):
+            # float32 rows straight from the model, no list of Python floats per chunk
+            batch_embeddings = embedder.embed_many([chunk.page_content for chunk in batch])
+        else:
+            batch_embeddings = embedder.embed(batch)
         all_embeddings.extend(batch_embeddings)
         progress = min(100, int((i + len(batch)) / len(chunks) * 100))
         print(f"[Ingest] Embedding progress: {progress}% ({i + len(batch)}/{len(chunks)})")
 
     # Step 3: Store in Chroma
     print(f"[Ingest] Storing {len(chunks)} chunks in Chroma collection '{collection_name}'...")
-    store = ChromaVectorStore(collection_name=collection_name, embedder=embedder)
-    store.add_documents(chunks)
+    store = ChromaVectorStore(collection_name=collection_name, embedder=embedder, persist_path=persist_path)
+    ids = None
+    if source:
+        # Drop this source's stale chunks (changed file or forced re-ingest) so they are
+        # not duplicated; ids derived from the source cannot clash with other files
+        store.collection.delete(where={"source": source})
+        ids = [f"{source}#{i}" for i in range(len(chunks))]
+    # Hand over the vectors computed above so the chunks are not embedded a second time
+    store.add_documents(chunks, embeddings=all_embeddings, ids=ids)
     store.persist()
 
     print(f"[Ingest] Successfully ingested {len(chunks)} chunks into Chroma collection '{collection_name}'")
+    return len(chunks)
@@ -21,5 +21,7 @@ class FakeLLM:
         Returns:
             str: A mock response
         """
-        # Simple fake model for testing
-        return f"Mock answer to: {prompt_or_query.split('Question:')[-1].strip() if 'Question:' in prompt_or_query else prompt_or_query}"
+        # Simple fake model for testing: echo the question back.
+        # rpartition finds the last "Question:" in one pass without splitting the whole prompt.
+        _, marker, question = prompt_or_query.rpartition('Question:')
+        return f"Mock answer to: {question.strip() if marker else question}"
@@ -1,5 +1,6 @@
-from typing import List
-from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
+from threading import Thread
+from typing import Iterator, List
+from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM, TextIteratorStreamer
 from llmrag.models.base_model import BaseModel
 from langchain_core.documents import Document
 import torch
@@ -25,6 +26,10 @@ class TransformersModel(BaseModel):
             Generates text from a given prompt.
         generate(query: str, documents: List[Document]) -> str:
             Generates text from a query and context documents.
+        generate_stream(prompt: str, temperature: float) -> Iterator[str]:
+            Yields the generated text chunk by chunk as it is produced.
+        generate_batch(prompts: List[str], temperature: float) -> List[str]:
+            Generates answers for several prompts in one forward pass per step.
     """
 
     def __init__(self, model_name="gpt2-large", device="cpu"):
@@ -68,6 +73,12 @@ class TransformersModel(BaseModel):
             # Use pipeline for smaller models
             self.generator = pipeline("text-generation", model=model_name, device=device_id)
             self.use_pipeline = True
+        
+        # GPT-2 has no padding token; reuse end-of-text so generate_batch() can
+        # pad. Set once here because the tokenizer is shared between threads.
+        _, tokenizer = self._model_and_tokenizer()
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
 
     def generate(self, prompt_or_query: str, temperature: float = 0.7, documents: List[Document] = None) -> str:
         """
@@ -89,7 +100,155 @@ class TransformersModel(BaseModel):
             documents (List[Document], optional): Context documents for RAG-style generation
             
         Returns:
-            str: The generated text
+            str: The generated text, without the prompt (same for every model)
+        """
+        prompt = self._build_prompt(prompt_or_query, documents)
+        model, tokenizer = self._model_and_tokenizer()
+        inputs = self._encode(tokenizer, [prompt])
+        
+        with torch.no_grad():
+            outputs = self._generate_tokens(model, tokenizer, inputs, temperature)
+        
+        # Return only the new tokens, never the prompt
+        return self._decode_new_tokens(tokenizer, inputs, outputs)[0]
+
+    def generate_stream(self, prompt_or_query: str, temperature: float = 0.7, documents: List[Document] = None) -> Iterator[str]:
+        """
+        Generate text like generate(), yielding chunks as they are decoded.
+        
+        STUDENT EXPLANATION:
+        model.generate() runs in a background thread and pushes each decoded
+        piece of text into a TextIteratorStreamer, which we iterate over here.
+        A chat UI can show the first words right away instead of waiting for
+        the whole answer. Only the new text is yielded, never the prompt.
+        
+        Args:
+            prompt_or_query (str): The prompt or query to generate from
+            temperature (float): Sampling temperature for generation
+            documents (List[Document], optional): Context documents for RAG-style generation
+            
+        Yields:
+            str: Pieces of the generated text
+        """
+        prompt = self._build_prompt(prompt_or_query, documents)
+        model, tokenizer = self._model_and_tokenizer()
+        inputs = self._encode(tokenizer, [prompt])
+        streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        errors = []
+        
+        def run_generation():
+            try:
+                with torch.no_grad():
+                    self._generate_tokens(model, tokenizer, inputs, temperature, streamer=streamer)
+            except Exception as e:
+                # Unblock the consumer, then re-raise the error on its side
+                errors.append(e)
+                streamer.end()
+        
+        thread = Thread(target=run_generation, daemon=True)
+        thread.start()
+        
+        yield from streamer
+        thread.join()
+        if errors:
+            raise errors[0]
+
+    def generate_batch(self, prompts: List[str], temperature: float = 0.7) -> List[str]:
+        """
+        Generate answers for several prompts at once.
+        
+        STUDENT EXPLANATION:
+        The prompts are padded to the same length and sent through the model
+        together, so each generation step handles all of them in one pass
+        instead of one pass per prompt. GPT-2 reads left to right, so padding
+        goes on the left to keep every prompt's last token next to its answer.
+        
+        Args:
+            prompts (List[str]): Complete prompts (already including any context)
+            temperature (float): Sampling temperature for generation
+            
+        Returns:
+            List[str]: The generated text for each prompt, without the prompt itself
+        """
+        model, tokenizer = self._model_and_tokenizer()
+        inputs = self._encode(tokenizer, prompts)
+        
+        with torch.no_grad():
+            outputs = self._generate_tokens(model, tokenizer, inputs, temperature)
+        
+        return self._decode_new_tokens(tokenizer, inputs, outputs)
+
+    def _model_and_tokenizer(self):
+        """The causal LM and tokenizer, whether loaded directly or through a pipeline."""
+        if self.use_pipeline:
+            return self.generator.model, self.generator.tokenizer
+        return self.model, self.tokenizer
+
+    def _encode(self, tokenizer, prompts: List[str]):
+        """
+        Tokenize prompts (left-padded if there are several) onto the model's device.
+        
+        The tokenizer is shared between threads (e.g. Streamlit sessions), so
+        the padding side is passed per call instead of set on the tokenizer.
+        """
+        if len(prompts) > 1:
+            inputs = tokenizer(prompts, return_tensors="pt", padding=True, padding_side="left")
+        else:
+            inputs = tokenizer(prompts, return_tensors="pt")
+        inputs = inputs.to(self.torch_device)
+        if self.device == "mps":
+            # Ensure inputs are the right dtype for MPS
+            inputs["input_ids"] = inputs["input_ids"].to(torch.int64)
+        return inputs
+
+    def _generate_tokens(self, model, tokenizer, inputs, temperature: float, streamer=None):
+        """
+        Run model.generate() with the sampling settings shared by generate(),
+        generate_stream() and generate_batch().
+        
+        STUDENT NOTE:
+        Sampling occasionally fails with "probability tensor contains inf/nan".
+        We then retry with short greedy decoding, which never samples. When
+        streaming, the greedy answer is handed to the streamer in one piece.
+        """
+        pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+        try:
+            return model.generate(
+                **inputs,
+                streamer=streamer,
+                max_new_tokens=150,  # Reduced for stability
+                temperature=min(temperature, 0.8),  # Cap temperature
+                do_sample=True,
+                top_p=0.85,  # More conservative
+                repetition_penalty=1.05,  # Reduced penalty
+                pad_token_id=pad_token_id,
+                eos_token_id=tokenizer.eos_token_id
+            )
+        except RuntimeError as e:
+            if "probability tensor" not in str(e):
+                raise e
+            # Fallback to greedy decoding
+            outputs = model.generate(
+                **inputs,
+                max_new_tokens=50,
+                do_sample=False,  # Greedy decoding
+                pad_token_id=pad_token_id,
+                eos_token_id=tokenizer.eos_token_id
+            )
+            if streamer is not None:
+                streamer.on_finalized_text(self._decode_new_tokens(tokenizer, inputs, outputs)[0], stream_end=True)
+            return outputs
+
+    def _decode_new_tokens(self, tokenizer, inputs, outputs) -> List[str]:
+        """Decode each row of `outputs` without its prompt tokens."""
+        new_tokens = outputs[:, inputs["input_ids"].shape[1]:]
+        return [text.strip() for text in tokenizer.batch_decode(new_tokens, skip_special_tokens=True)]
+
+    def _build_prompt(self, prompt_or_query: str, documents: List[Document] = None) -> str:
+        """
+        Wrap a query and its context documents in the climate science prompt.
+        
+        Without documents the prompt is returned unchanged.
         """
         if documents is not None:
             # RAG-style generation with climate science context
@@ -116,75 +275,4 @@ ANSWER:"""
             # Direct prompt generation
             prompt = prompt_or_query
 
-        if self.use_pipeline:
-            # Use pipeline for smaller models with safer parameters
-            try:
-                response = self.generator(
-                    prompt, 
-                    max_new_tokens=150,  # Reduced for stability
-                    temperature=min(temperature, 0.8),  # Cap temperature
-                    pad_token_id=50256,
-                    do_sample=True,
-                    top_p=0.85,  # Slightly more conservative
-                    repetition_penalty=1.05,  # Reduced penalty
-                    num_return_sequences=1
-                )
-                return response[0]["generated_text"]
-            except RuntimeError as e:
-                if "probability tensor" in str(e):
-                    # Fallback to more conservative parameters
-                    response = self.generator(
-                        prompt,
-                        max_new_tokens=50,
-                        temperature=0.5,
-                        do_sample=False,  # Use greedy decoding
-                        pad_token_id=50256
-                    )
-                    return response[0]["generated_text"]
-                else:
-                    raise e
-        else:
-            # Direct generation for larger models
-            inputs = self.tokenizer.encode(prompt, return_tensors="pt")
-            
-            # Move inputs to the same device as the model
-            if hasattr(self, 'torch_device'):
-                inputs = inputs.to(self.torch_device)
-                # Ensure inputs are the right dtype for MPS
-                if self.device == "mps":
-                    inputs = inputs.to(torch.int64)
-            
-            # Create attention mask
-            attention_mask = torch.ones_like(inputs)
-            
-            with torch.no_grad():
-                try:
-                    outputs = self.model.generate(
-                        inputs,
-                        attention_mask=attention_mask,
-                        max_new_tokens=150,  # Reduced for stability
-                        temperature=min(temperature, 0.8),  # Cap temperature
-                        do_sample=True,
-                        top_p=0.85,  # More conservative
-                        repetition_penalty=1.05,  # Reduced penalty
-                        pad_token_id=self.tokenizer.eos_token_id,
-                        eos_token_id=self.tokenizer.eos_token_id
-                    )
-                except RuntimeError as e:
-                    if "probability tensor" in str(e):
-                        # Fallback to greedy decoding
-                        outputs = self.model.generate(
-                            inputs,
-                            attention_mask=attention_mask,
-                            max_new_tokens=50,
-                            do_sample=False,  # Greedy decoding
-                            pad_token_id=self.tokenizer.eos_token_id,
-                            eos_token_id=self.tokenizer.eos_token_id
-                        )
-                    else:
-                        raise e
-            
-            # Decode and return only the new tokens
-            generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            # Remove the original prompt
-            return generated_text[len(prompt):].strip()
+        return prompt
@@ -39,12 +39,93 @@ class RAGPipeline:
                 - context: List of retrieved documents
                 - paragraph_ids: List of unique paragraph IDs from the context documents
         """
-        # Check if this is an Executive Summary query
-        if self._is_executive_summary_query(query):
-            # Use fewer documents and focus on executive summary content
-            documents = self.vector_store.retrieve(query + " executive summary", top_k=2)
+        unique_docs, prompt = self._prepare(query, top_k)
+        answer = self.model.generate(prompt, temperature=temperature)
+        
+        return {
+            "answer": answer,
+            "context": unique_docs,
+            "paragraph_ids": self._collect_paragraph_ids(unique_docs)
+        }
+
+    def stream(self, query: str, top_k=4, temperature=0.3) -> dict:
+        """
+        Like run(), but the answer is returned as an iterator of text chunks.
+
+        Retrieval happens up front; generation starts when the iterator is
+        consumed. Models without `generate_stream` yield their full answer
+        as a single chunk.
+
+        Returns:
+            dict: Same keys as run(), with `answer_stream` in place of `answer`.
+        """
+        unique_docs, prompt = self._prepare(query, top_k)
+
+        if hasattr(self.model, "generate_stream"):
+            answer_stream = self.model.generate_stream(prompt, temperature=temperature)
+        else:
+            answer_stream = iter([self.model.generate(prompt, temperature=temperature)])
+
+        return {
+            "answer_stream": answer_stream,
+            "context": unique_docs,
+            "paragraph_ids": self._collect_paragraph_ids(unique_docs)
+        }
+
+    def run_batch(self, queries: list, top_k=4, temperature=0.3) -> list:
+        """
+        Run several queries, generating all answers in one batched model call.
+
+        If the vector store has `similarity_search_batch`, all plain semantic
+        queries are retrieved with that one call; section and executive
+        summary queries are retrieved one by one as in run(). Generation uses
+        the model's `generate_batch` when it has one and falls back to one
+        `generate` call per query otherwise.
+
+        Returns:
+            list: One run()-style result dict per query, in order.
+        """
+        retrieved = {}
+        if hasattr(self.vector_store, "similarity_search_batch"):
+            plain = [
+                i for i, query in enumerate(queries)
+                if not self._is_executive_summary_query(query) and not self._extract_section_query(query)
+            ]
+            if plain:
+                batch_docs = self.vector_store.similarity_search_batch([queries[i] for i in plain], top_k=top_k)
+                retrieved = dict(zip(plain, batch_docs))
+
+        prepared = [self._prepare(query, top_k, retrieved.get(i)) for i, query in enumerate(queries)]
+        prompts = [prompt for _, prompt in prepared]
+
+        if hasattr(self.model, "generate_batch"):
+            answers = self.model.generate_batch(prompts, temperature=temperature)
         else:
-            documents = self.vector_store.retrieve(query, top_k=top_k)
+            answers = [self.model.generate(prompt, temperature=temperature) for prompt in prompts]
+
+        return [
+            {
+                "answer": answer,
+                "context": unique_docs,
+                "paragraph_ids": self._collect_paragraph_ids(unique_docs)
+            }
+            for (unique_docs, _), answer in zip(prepared, answers)
+        ]
+
+    def _prepare(self, query: str, top_k: int, documents=None):
+        """
+        Retrieve and deduplicate context documents and build the prompt.
+
+        `documents` are already-retrieved results for `query` (see run_batch());
+        when omitted they are retrieved here.
+        """
+        if documents is None:
+            # Check if this is an Executive Summary query
+            if self._is_executive_summary_query(query):
+                # Use fewer documents and focus on executive summary content
+                documents = self.vector_store.retrieve(query + " executive summary", top_k=2)
+            else:
+                documents = self.vector_store.retrieve(query, top_k=top_k)
 
         # Deduplicate context to reduce redundancy
         seen = set()
@@ -69,11 +150,14 @@ class RAGPipeline:
             # Use the enhanced scientific prompt for general queries
             prompt = self._create_scientific_prompt(context, query)
 
-        answer = self.model.generate(prompt, temperature=temperature)
-        
-        # Extract paragraph IDs from the retrieved documents
+        return unique_docs, prompt
+
+    def _collect_paragraph_ids(self, docs) -> list:
+        """
+        Extract unique paragraph IDs, in order, from the documents' metadata.
+        """
         paragraph_ids = []
-        for doc in unique_docs:
+        for doc in docs:
             if hasattr(doc, 'metadata') and doc.metadata:
                 if 'paragraph_ids' in doc.metadata and doc.metadata['paragraph_ids']:
                     # Split comma-separated string back into list
@@ -81,13 +165,7 @@ class RAGPipeline:
                     paragraph_ids.extend([id.strip() for id in ids if id.strip()])
         
         # Remove duplicates while preserving order
-        unique_paragraph_ids = list(dict.fromkeys(paragraph_ids))
-        
-        return {
-            "answer": answer,
-            "context": unique_docs,
-            "paragraph_ids": unique_paragraph_ids
-        }
+        return list(dict.fromkeys(paragraph_ids))
 
     def _create_scientific_prompt(self, context: str, query: str) -> str:
         """
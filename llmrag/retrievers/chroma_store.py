@@ -1,7 +1,8 @@
 import logging
-import shutil
-import tempfile
+import os
 import re
+from functools import lru_cache
+from uuid import uuid4
 from typing import List, Tuple
 
 import chromadb
@@ -13,25 +14,60 @@ from llmrag.retrievers.base_vector_store import BaseVectorStore
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHROMA_PATH = "./chroma_db"
+
+
+def get_chroma_client(path: str = DEFAULT_CHROMA_PATH):
+    """
+    Return the process-wide PersistentClient for `path`, creating it on first use.
+
+    Stores, ingestion and the store manager all share one client per directory
+    instead of each opening (and re-validating) their own.
+    """
+    return _persistent_client(os.path.abspath(path))
+
+
+@lru_cache(maxsize=None)
+def _persistent_client(abs_path: str):
+    return chromadb.PersistentClient(
+        path=abs_path,
+        settings=Settings(anonymized_telemetry=False)
+    )
+
+
 class ChromaVectorStore(BaseVectorStore):
-    def __init__(self, embedder, collection_name="rag_collection", persist=True):
+    def __init__(self, embedder, collection_name="rag_collection", persist=True, hnsw_config=None, persist_path=None):
+        """
+        Args:
+            embedder: Embedder used for add_texts() and similarity_search_batch().
+            collection_name (str): Name of the Chroma collection.
+            persist (bool): Store under ./chroma_db; False keeps the collection in memory,
+                under a Chroma name unique to this instance (collection_name is unchanged).
+            hnsw_config (dict, optional): HNSW index settings applied when the collection
+                is created, e.g. {"M": 8, "construction_ef": 32, "search_ef": 10}.
+                Chroma's defaults are used if omitted.
+            persist_path (str, optional): Directory for the persistent store instead of
+                ./chroma_db, e.g. a pytest tmp_path.
+        """
         self.embedder = embedder
         self.collection_name = collection_name
+        # Name of the underlying Chroma collection; only differs for in-memory stores
+        self._chroma_collection_name = collection_name
         self.should_persist = persist
 
         if self.should_persist:
-            self.chroma_path = "./chroma_db"
+            self.chroma_path = str(persist_path or DEFAULT_CHROMA_PATH)
+            self.client = get_chroma_client(self.chroma_path)
         else:
-            # Use a temporary directory for test
-            self._temp_dir = tempfile.mkdtemp()
-            self.chroma_path = self._temp_dir
-
-        self.client = chromadb.PersistentClient(
-            path=self.chroma_path,
-            settings=Settings(anonymized_telemetry=False)
-        )
+            # In-memory store for tests: nothing is written to disk
+            self.chroma_path = None
+            self.client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False))
+            # All in-memory clients share one process-wide store; a per-instance name
+            # keeps two stores with the same collection_name from seeing each other's data
+            self._chroma_collection_name = f"{collection_name}-{uuid4().hex}"
         self.docs = []
-        self.collection = self.client.get_or_create_collection(self.collection_name)
+        metadata = {f"hnsw:{key}": value for key, value in hnsw_config.items()} if hnsw_config else None
+        self.collection = self.client.get_or_create_collection(self._chroma_collection_name, metadata=metadata)
 
     def persist(self):
         if self.should_persist and hasattr(self.client, "persist"):
@@ -52,6 +88,51 @@ class ChromaVectorStore(BaseVectorStore):
         """
         return self.retrieve(query, top_k)
 
+    def similarity_search_batch(self, queries: List[str], top_k: int = 4) -> List[List[Document]]:
+        """
+        Semantic search for several queries at once.
+
+        The queries are embedded in one batch and sent to Chroma in a single
+        query call instead of one round trip per query.
+
+        Args:
+            queries (List[str]): The user queries.
+            top_k (int): Number of top results to return per query.
+
+        Returns:
+            List[List[Document]]: Top matching documents for each query, in order.
+        """
+        if not queries:
+            return []
+        return self._query_by_texts(list(queries), top_k)
+
+    def _query_by_texts(self, queries: List[str], top_k: int) -> List[List[Document]]:
+        """
+        Embed queries with self.embedder and search by vector.
+
+        retrieve() and similarity_search_batch() both come through here, so a
+        query finds the same chunks whether it is asked alone or in a batch.
+        """
+        if len(queries) == 1:
+            # embed_query() keeps the embedder's per-query cache in play
+            query_embeddings = [self.embedder.embed_query(queries[0])]
+        else:
+            query_embeddings = self.embedder.embed(queries)
+        return self._query_by_vectors(query_embeddings, top_k)
+
+    def _query_by_vectors(self, query_embeddings, top_k: int) -> List[List[Document]]:
+        results = self.collection.query(query_embeddings=query_embeddings, n_results=top_k)
+        return [
+            [
+                Document(
+                    page_content=text,
+                    metadata=meta if meta is not None else {}
+                )
+                for text, meta in zip(texts, metas)
+            ]
+            for texts, metas in zip(results["documents"], results["metadatas"])
+        ]
+
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[Tuple[str, float]]:
         if self.collection is None:
             raise ValueError("No collection initialized.")
@@ -67,22 +148,56 @@ class ChromaVectorStore(BaseVectorStore):
         return list(zip(docs, distances))
 
     def add_texts(self, texts: List[str]):
-        embeddings = self.embedder.embed_documents(texts)
         ids = [f"doc_{i}" for i in range(len(texts))]
-        self.collection.add(documents=texts, embeddings=embeddings, ids=ids)
+        self.collection.add(documents=texts, embeddings=self._embed_texts(texts), ids=ids)
+
+    def _embed_texts(self, texts: List[str]):
+        """Embed texts for storage with self.embedder, the same embedder queries use."""
+        # Hand Chroma a NumPy array when the embedder can produce one, instead of nested lists
+        if hasattr(self.embedder, "embed_many"):
+            return self.embedder.embed_many(texts)
+        return self.embedder.embed_documents(texts)
 
     def cleanup(self):
-        # Only cleanup if it was a temp dir
-        if not self.should_persist and hasattr(self, "_temp_dir"):
-            shutil.rmtree(self._temp_dir, ignore_errors=True)
+        # Only cleanup in-memory stores; persisted collections are kept
+        if not self.should_persist:
+            self._drop_collection()
 
-    def add_documents(self, docs: List[Document]):
-        for i, doc in enumerate(docs):
-            logger.info(f"doc_type {type(doc)}")
+    def _drop_collection(self):
+        try:
+            self.client.delete_collection(self._chroma_collection_name)
+        except Exception:
+            # Collection doesn't exist
+            pass
+
+    def add_documents(self, docs: List[Document], embeddings=None, batch_size: int = 256, ids=None):
+        """
+        Add documents to the collection.
+
+        Args:
+            docs (List[Document]): Documents to add.
+            embeddings: Optional precomputed vectors aligned with `docs` (e.g. a read-only
+                np.memmap), which must come from self.embedder. Computed with
+                self.embedder if omitted. Documents are added in slices of `batch_size`
+                so only one slice of vectors is materialised at a time.
+            batch_size (int): Slice size for each Chroma add call.
+            ids (List[str], optional): Chroma ids aligned with `docs`.
+                Numbered "doc-N" ids continuing from the collection size are used if omitted.
+        """
+        if embeddings is None:
+            # Stored vectors must come from the embedder retrieve() queries with,
+            # not from Chroma's default embedding function
+            embeddings = self._embed_texts([doc.page_content for doc in docs])
+        if ids is None:
+            offset = self.collection.count()
+            ids = [f"doc-{offset + i}" for i in range(len(docs))]
+        for start in range(0, len(docs), batch_size):
+            batch = docs[start:start + batch_size]
             self.collection.add(
-                documents=[doc.page_content],
-                metadatas=[doc.metadata],
-                ids=[f"doc-{len(self.collection.get()['ids']) + i}"]
+                documents=[doc.page_content for doc in batch],
+                metadatas=[doc.metadata for doc in batch],
+                embeddings=embeddings[start:start + len(batch)],
+                ids=ids[start:start + len(batch)]
             )
 
     def retrieve(self, query: str, top_k=4) -> List[Document]:
@@ -155,12 +270,8 @@ class ChromaVectorStore(BaseVectorStore):
     def _retrieve_by_semantic(self, query: str, top_k: int) -> List[Document]:
         """
         Retrieve documents using semantic similarity search.
+
+        The query is embedded with self.embedder, like the stored documents;
+        Chroma's query_texts would use its own default embedding function.
         """
-        results = self.collection.query(query_texts=[query], n_results=top_k)
-        return [
-            Document(
-                page_content=text,
-                metadata=meta if meta is not None else {}
-            )
-            for text, meta in zip(results["documents"][0], results["metadatas"][0])
-        ]
\ No newline at end of file
+        return self._query_by_texts([query], top_k)[0]
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Disk-backed embedding export.
+
+Writes embeddings batch by batch into a preallocated numpy.memmap so that a
+large corpus never needs a second full in-RAM copy of its vectors.
+"""
+
+import os
+import tempfile
+from typing import List, Optional
+
+import numpy as np
+
+
+def export_embeddings_memmap(embedder, texts: List[str], path: Optional[str] = None, batch_size: int = 64) -> np.memmap:
+    """
+    Embed texts in batches into a float32 memmap of shape (len(texts), dim).
+
+    Args:
+        embedder: An object that implements `embed_documents(texts) -> List[List[float]]`.
+        texts (List[str]): The texts to embed.
+        path (str, optional): File to back the memmap. The file stays on disk and belongs
+            to the caller. If omitted, a temporary file is created instead; it is not removed
+            automatically, so delete `result.filename` once the vectors have been consumed.
+        batch_size (int): Number of texts embedded per call.
+
+    Returns:
+        np.memmap: A read-only view of the embeddings. Slices can be passed straight
+        to a vector store without materialising the whole matrix.
+    """
+    if not texts:
+        raise ValueError("No texts to embed.")
+
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".f32")
+        os.close(fd)
+
+    # The first batch doubles as the probe that tells us the embedding dimension
+    first = np.asarray(embedder.embed_documents(texts[:batch_size]), dtype=np.float32)
+    shape = (len(texts), first.shape[1])
+
+    emb_mm = np.memmap(path, dtype=np.float32, mode="w+", shape=shape)
+    emb_mm[:len(first)] = first
+    for start in range(batch_size, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        emb_mm[start:start + len(batch)] = embedder.embed_documents(batch)
+    emb_mm.flush()
+    del emb_mm
+
+    return np.memmap(path, dtype=np.float32, mode="r", shape=shape)
@@ -1,33 +1,66 @@
+import hashlib
 import os
+import tempfile
 from typing import List
-from pathlib import Path
 from langchain_core.documents import Document
 from llmrag.models import load_model
 from llmrag.embeddings import load_embedder
 from llmrag.retrievers import load_vector_store
+from llmrag.pipelines.rag_pipeline import RAGPipeline
+from llmrag.utils.embedding_export import export_embeddings_memmap
+
+VALID_EXTENSIONS = (".txt", ".html", ".htm")
 
 def load_documents_from_file(file_path: str) -> List[Document]:
-    ext = Path(file_path).suffix.lower()
     with open(file_path, "r", encoding="utf-8") as f:
         content = f.read()
-    return [Document(page_content=content, metadata={"source": file_path, "format": ext[1:]})]
+    return [Document(page_content=content, metadata={"source": file_path, "format": os.path.splitext(file_path)[1][1:].lower()})]
+
+def _iter_document_paths(directory: str):
+    # os.scandir reuses the directory entry's cached stat instead of stat-ing every path
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_document_paths(entry.path)
+            elif entry.is_file() and entry.name.lower().endswith(VALID_EXTENSIONS):
+                yield entry.path
 
 def load_documents_from_dir(directory: str) -> List[Document]:
     documents = []
-    for root, _, files in os.walk(directory):
-        for fname in files:
-            if fname.lower().endswith((".txt", ".html", ".htm")):
-                path = os.path.join(root, fname)
-                documents.extend(load_documents_from_file(path))
+    for path in _iter_document_paths(directory):
+        documents.extend(load_documents_from_file(path))
     return documents
 
-def build_pipeline(model_name: str, embedding_model: str, vector_store_type: str, documents: List[Document]):
+def documents_cache_key(embedding_model: str, vector_store_type: str, documents: List[Document]) -> str:
+    """Short BLAKE2b digest identifying an index: the embedder, the store type and every document's text."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{embedding_model}\0{vector_store_type}".encode("utf-8"))
+    for doc in documents:
+        digest.update(b"\0")
+        digest.update(doc.page_content.encode("utf-8"))
+    return digest.hexdigest()
+
+def build_pipeline(model_name: str, embedding_model: str, vector_store_type: str, documents: List[Document], embeddings_path: str = None):
     model = load_model({"model_name": model_name, "device": "cpu"})
     embedder = load_embedder({"model_name": embedding_model, "device": "cpu"})
-    vector_store = load_vector_store({"type": vector_store_type}, embedder)
 
-    if documents:
-        vector_store.add_documents(documents)
+    # Same embedder + same documents -> same collection, so a persistent index from an earlier build is reused
+    collection_name = f"rag_{documents_cache_key(embedding_model, vector_store_type, documents)}" if documents else "rag_collection"
+    vector_store = load_vector_store({"type": vector_store_type}, embedder, collection_name=collection_name)
+    already_indexed = hasattr(vector_store, "collection") and vector_store.collection.count() > 0
+
+    if documents and not already_indexed:
+        # Embeddings are streamed to a disk-backed memmap and handed to the store as a read-only view
+        texts = [doc.page_content for doc in documents]
+        if embeddings_path:
+            # The caller asked for this file, so it is kept
+            embeddings = export_embeddings_memmap(embedder, texts, path=embeddings_path)
+            vector_store.add_documents(documents, embeddings=embeddings)
+        else:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                embeddings = export_embeddings_memmap(embedder, texts, path=os.path.join(tmp_dir, "embeddings.f32"))
+                vector_store.add_documents(documents, embeddings=embeddings)
+                # Close the mapping before the directory (and the file) is removed
+                del embeddings
 
-    from llmrag.pipelines.rag_pipeline import RAGPipeline
     return RAGPipeline(model=model, vector_store=vector_store)
@@ -4,11 +4,11 @@ Utilities for managing and inspecting cached vector stores.
 """
 
 import os
-import chromadb
-from chromadb.config import Settings
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from llmrag.retrievers.chroma_store import get_chroma_client
+
 class VectorStoreManager:
     """
     Manages and inspects existing ChromaDB vector stores.
@@ -19,10 +19,7 @@ class VectorStoreManager:
         self.client = None
         
         if self.chroma_path.exists():
-            self.client = chromadb.PersistentClient(
-                path=str(self.chroma_path),
-                settings=Settings(anonymized_telemetry=False)
-            )
+            self.client = get_chroma_client(str(self.chroma_path))
     
     def list_collections(self) -> List[Dict]:
         """
@@ -1,6 +1,12 @@
 import yaml
 from langchain_core.documents import Document
 
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 def load_paragraphs_yaml(path):
     """
     Loads a YAML file containing paragraphs with metadata.
@@ -12,6 +18,6 @@ def load_paragraphs_yaml(path):
         List[Document]: List of Document instances.
     """
     with open(path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_Loader)
 
     return [Document(page_content=entry["text"], metadata={"id": entry["id"]}) for entry in data]
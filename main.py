@@ -82,6 +82,8 @@
 #     main()
 
 import argparse
+import functools
+from importlib import metadata
 from pathlib import Path
 
 from llmrag.ingestion.ingest_html import ingest_html_file
@@ -93,13 +95,20 @@ from llmrag.pipelines.rag_pipeline import RAGPipeline
 import tomllib
 
 
+@functools.lru_cache(maxsize=1)
 def get_version():
-    """Extracts version from pyproject.toml"""
+    """Returns the installed package version, falling back to pyproject.toml in a source checkout"""
     try:
-        with open("pyproject.toml", "rb") as f:
+        return metadata.version("llmrag")
+    except metadata.PackageNotFoundError:
+        pass
+
+    pyproject_path = Path(__file__).resolve().parent / "pyproject.toml"
+    try:
+        with open(pyproject_path, "rb") as f:
             data = tomllib.load(f)
         return data["project"]["version"]
-    except Exception:
+    except (OSError, tomllib.TOMLDecodeError, KeyError):
         return "unknown"
 
 
@@ -108,6 +117,7 @@ def main():
     parser.add_argument("--html", required=True, help="Path to the input HTML file.")
     parser.add_argument("--query", required=True, help="User query to ask the system.")
     parser.add_argument("--collection", default="html_collection", help="Name of the vector store collection.")
+    parser.add_argument("--force-reingest", action="store_true", help="Re-ingest the HTML even if it is already in the collection.")
     parser.add_argument("--version", action="store_true", help="Show version and exit.")
     args = parser.parse_args()
 
@@ -120,9 +130,9 @@ def main():
         print(f"[ERROR] HTML file not found: {args.html}")
         return
 
-    # Step 1: Ingest
+    # Step 1: Ingest (skipped when the collection already holds this file's chunks)
     print("[INFO] Ingesting HTML...")
-    ingest_html_file(str(html_path), collection_name=args.collection)
+    ingest_html_file(str(html_path), collection_name=args.collection, force_reingest=args.force_reingest)
 
     # Step 2: Initialize RAG components
     embedder = SentenceTransformersEmbedder()
@@ -8,7 +8,6 @@ Each component is designed to be configurable and reusable.
 __version__ = "1.0.0"
 __author__ = "IPCC Pipeline Team"
 
-from .downloader import WebDownloader
 from .cleaner import ContentCleaner
 from .structurer import ContentStructurer
 from .chunker import ContentChunker
@@ -24,4 +23,12 @@ __all__ = [
     'DictionaryExtractor',
     'EncyclopediaBuilder',
     'QualityChecker'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # WebDownloader pulls in Selenium, which is slow to import; load it on first use only
+    if name == 'WebDownloader':
+        from .downloader import WebDownloader
+        return WebDownloader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
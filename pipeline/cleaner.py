@@ -44,16 +44,30 @@ class ContentCleaner:
         Returns:
             Cleaned HTML content
         """
-        # First, extract main content
-        extracted_content = self._extract_content(html_content)
+        return self.serialize(self.clean_tree(html_content))
+    
+    def clean_tree(self, html_content: str) -> etree._Element:
+        """
+        Clean HTML content and return the lxml tree, for consumers that keep working on the tree.
         
-        # Then apply cleaning rules
-        cleaned_content = self._apply_cleaners(extracted_content)
+        Args:
+            html_content: Raw HTML content
+            
+        Returns:
+            Cleaned lxml tree
+        """
+        # First, extract main content into a parsed tree
+        tree = self._extract_content(html_content)
         
-        return cleaned_content
+        # Then apply cleaning rules to the same tree
+        return self._apply_cleaners(tree)
+    
+    def serialize(self, tree) -> str:
+        """Serialize a cleaned tree to an HTML string."""
+        return etree.tostring(tree, encoding='unicode', pretty_print=True)
     
-    def _extract_content(self, html_content: str) -> str:
-        """Extract main content using configured extractors."""
+    def _extract_content(self, html_content: str) -> etree._Element:
+        """Extract main content using configured extractors and return it as an lxml tree."""
         extractors = self.config.get('extractors', ['readability'])
         
         for extractor in extractors:
@@ -67,26 +81,24 @@ class ContentCleaner:
             except Exception as e:
                 self.logger.warning(f"Failed to extract with {extractor}: {e}")
         
-        # Fallback: return original content
-        return html_content
+        # Fallback: parse the original content
+        return html.fromstring(html_content)
     
-    def _extract_with_readability(self, html_content: str) -> str:
+    def _extract_with_readability(self, html_content: str) -> etree._Element:
         """Extract content using Readability."""
         doc = Document(html_content)
-        return doc.summary()
+        return html.fromstring(doc.summary())
     
-    def _extract_with_trafilatura(self, html_content: str) -> str:
+    def _extract_with_trafilatura(self, html_content: str) -> etree._Element:
         """Extract content using Trafilatura."""
-        extracted = trafilatura.extract(html_content, include_formatting=True)
-        return extracted if extracted else html_content
+        # HTML output keeps the h1-h6/p/li tags that the structurer relies on
+        extracted = trafilatura.extract(html_content, output_format='html', include_formatting=True)
+        return html.fromstring(extracted if extracted else html_content)
     
-    def _apply_cleaners(self, html_content: str) -> str:
-        """Apply cleaning rules to HTML content."""
+    def _apply_cleaners(self, tree) -> etree._Element:
+        """Apply cleaning rules to a parsed HTML tree."""
         cleaners = self.config.get('cleaners', [])
         
-        # Parse HTML
-        tree = html.fromstring(html_content)
-        
         for cleaner in cleaners:
             if cleaner == 'remove_ads':
                 tree = self._remove_ads(tree)
@@ -99,7 +111,7 @@ class ContentCleaner:
             elif cleaner == 'clean_wordpress_markup':
                 tree = self._clean_wordpress_markup(tree)
         
-        return etree.tostring(tree, encoding='unicode', pretty_print=True)
+        return tree
     
     def _remove_ads(self, tree) -> etree._Element:
         """Remove advertisement elements."""
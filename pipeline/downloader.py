@@ -5,8 +5,8 @@ Downloads IPCC chapters from URLs using headless browsers.
 Supports Selenium for JavaScript-heavy sites.
 """
 
+import importlib.util
 import logging
-import time
 from typing import Dict, Any
 from pathlib import Path
 
@@ -22,10 +22,15 @@ except ImportError:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+# urllib3 decodes "br" responses itself when brotli is installed; we only need to know
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+
 
 class WebDownloader:
     """
@@ -37,7 +42,27 @@ class WebDownloader:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self._session = self._create_session() if REQUESTS_AVAILABLE else None
+        
+    def _create_session(self) -> "requests.Session":
+        """Create a keep-alive session with retries and compressed transfer."""
+        session = requests.Session()
         
+        retries = Retry(
+            total=self.config.get('retry_attempts', 3),
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504)
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            'Accept-Encoding': 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+        })
+        return session
+    
     def download(self, url: str) -> str:
         """
         Download content from a URL.
@@ -69,21 +94,31 @@ class WebDownloader:
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
         
+        # Images are not needed for text extraction; skipping them cuts bytes transferred
+        if self.config.get('disable_images', True):
+            options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        
         driver = webdriver.Chrome(options=options)
         
         try:
             self.logger.info(f"Downloading with Selenium: {url}")
             driver.get(url)
             
-            # Wait for page to load
-            wait_time = self.config.get('wait_time', 5)
-            time.sleep(wait_time)
-            
-            # Wait for main content to be present
+            # Wait until the document has finished loading rather than sleeping a fixed time
+            max_wait = self.config.get('max_wait', 15)
             try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                WebDriverWait(driver, max_wait).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
                 )
+                
+                # Optionally wait for a content-specific element to be present
+                ready_selector = self.config.get('ready_selector')
+                if ready_selector:
+                    WebDriverWait(driver, max_wait).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector))
+                    )
             except Exception as e:
                 self.logger.warning(f"Timeout waiting for page load: {e}")
             
@@ -100,11 +135,7 @@ class WebDownloader:
         if not REQUESTS_AVAILABLE:
             raise ImportError("Requests not available. Install with: pip install requests")
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30)
+        response = self._session.get(url, timeout=30)
         response.raise_for_status()
         
         return response.text 
\ No newline at end of file
@@ -5,10 +5,101 @@ Adds semantic paragraph IDs to HTML content for source tracking.
 Supports hierarchical ID generation algorithms.
 """
 
+import functools
 import logging
 from typing import Dict, Any, List
 from lxml import html, etree
-import re
+from lxml.html.defs import block_tags
+
+
+# Tags visited by a single document-order tree walk (replaces a multi-scan XPath union)
+_CONTENT_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li')
+_HEADING_LEVELS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+_SEQ_TAGS = ('p', 'li')
+
+_DEFAULT_ID_FORMAT = '{section}_{subsection}_{paragraph}'
+
+
+class _NormTable(dict):
+    """str.translate table mapping every character outside [a-z0-9] to '_'.
+
+    Entries for characters outside the prebuilt Latin-1 range are added on first use.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        self[codepoint] = '_'
+        return '_'
+
+
+_NORM_TABLE = _NormTable(
+    (c, chr(c) if chr(c) in 'abcdefghijklmnopqrstuvwxyz0123456789' else '_')
+    for c in range(256)
+)
+
+
+class _WalkState:
+    """Section and counter state carried through one annotation pass."""
+    
+    __slots__ = ('section', 'subsection', 'counter', 'id_format', 'default_format',
+                 'heading_id', 'p_prefix', 'li_prefix')
+    
+    def __init__(self, id_format: str):
+        self.section = "main"
+        self.subsection = "content"
+        self.counter = 1
+        self.id_format = id_format
+        # The default template is built by prefix concatenation instead of str.format
+        self.default_format = id_format == _DEFAULT_ID_FORMAT
+        self.update_prefixes()
+    
+    def update_prefixes(self) -> None:
+        """Recompute the ID prefixes after the section or subsection changes."""
+        base = f"{self.section}_{self.subsection}_"
+        self.heading_id = base + "heading"
+        self.p_prefix = base + "p"
+        self.li_prefix = base + "li"
+
+
+# Pure function of the heading text; headings such as "Introduction" recur across chapters
+@functools.lru_cache(maxsize=2048)
+def _normalize_id(text: str) -> str:
+    """Normalize text to create valid HTML IDs."""
+    # Convert to lowercase
+    normalized = text.lower()
+    
+    # Replace spaces and special characters with underscores, collapsing runs
+    normalized = normalized.translate(_NORM_TABLE)
+    while '__' in normalized:
+        normalized = normalized.replace('__', '_')
+    
+    # Remove leading/trailing underscores
+    normalized = normalized.strip('_')
+    
+    # Ensure it starts with a letter
+    if normalized and not normalized[0].isalpha():
+        normalized = f"section_{normalized}"
+    
+    return normalized or "section"
+
+
+def _drop_blank_text(tree) -> None:
+    """Remove whitespace-only text between block-level elements, in place.
+
+    Whitespace next to inline elements separates words, and <pre> content is
+    literal, so both are kept.
+    """
+    for element in tree.iter():
+        children = len(element)
+        if not children or element.tag == 'pre':
+            continue
+        if element.text is not None and not element.text.strip() and element[0].tag in block_tags:
+            element.text = None
+        for index, child in enumerate(element):
+            if child.tail is None or child.tail.strip() or child.tag not in block_tags:
+                continue
+            following = element[index + 1] if index + 1 < children else None
+            if following is None or following.tag in block_tags:
+                child.tail = None
 
 
 class ContentStructurer:
@@ -23,6 +114,15 @@ class ContentStructurer:
         self.logger = logging.getLogger(__name__)
         self.id_counter = 0
         
+        # One parser reused for every document; blank text nodes are dropped so the walk visits fewer nodes
+        self._parser = html.HTMLParser(remove_blank_text=True, collect_ids=False)
+        
+        # Per-tag handlers for the single annotation pass, one table per ID algorithm
+        self._hierarchical_handlers = {tag: self._annotate_heading for tag in _HEADING_LEVELS}
+        self._hierarchical_handlers['p'] = self._annotate_paragraph
+        self._hierarchical_handlers['li'] = self._annotate_list_item
+        self._sequential_handlers = {tag: self._annotate_sequential for tag in _SEQ_TAGS}
+        
     def structure(self, html_content: str) -> str:
         """
         Add structure and paragraph IDs to HTML content.
@@ -33,119 +133,98 @@ class ContentStructurer:
         Returns:
             HTML content with added paragraph IDs
         """
-        tree = html.fromstring(html_content)
-        
-        # Add paragraph IDs
-        if self.config.get('add_paragraph_ids', True):
-            tree = self._add_paragraph_ids(tree)
+        return self.serialize(self.structure_tree(html_content))
+    
+    def structure_tree(self, html_content) -> etree._Element:
+        """
+        Add structure and paragraph IDs, returning the lxml tree.
         
-        # Preserve headings and lists
-        if self.config.get('preserve_headings', True):
-            tree = self._preserve_headings(tree)
+        In-process consumers should use this instead of structure() to avoid a
+        serialize/parse round-trip between stages.
         
-        if self.config.get('preserve_lists', True):
-            tree = self._preserve_lists(tree)
+        Args:
+            html_content: Cleaned HTML content, or an already-parsed lxml tree
+                (which is annotated in place)
+            
+        Returns:
+            The annotated lxml tree
+        """
+        if isinstance(html_content, (str, bytes)):
+            tree = html.fromstring(html_content, parser=self._parser)
+        else:
+            # Parsed elsewhere, so the parser has not dropped blank text for us
+            tree = html_content
+            _drop_blank_text(tree)
         
-        return etree.tostring(tree, encoding='unicode', pretty_print=True)
+        # Headings and lists are left in place; IDs are added in one traversal
+        return self._walk_and_annotate(tree)
     
-    def _add_paragraph_ids(self, tree) -> etree._Element:
-        """Add semantic paragraph IDs to the document."""
+    def serialize(self, tree) -> str:
+        """Serialize an annotated tree to an HTML string."""
+        # Compact UTF-8 HTML; pretty-printing is overhead for downstream RAG stages
+        return etree.tostring(tree, encoding='utf-8', method='html').decode('utf-8')
+    
+    def _walk_and_annotate(self, tree) -> etree._Element:
+        """Annotate the document in a single tree walk, dispatching on element tag."""
+        if not self.config.get('add_paragraph_ids', True):
+            return tree
+        
         algorithm = self.config.get('id_algorithm', 'semantic_hierarchical')
-        id_format = self.config.get('id_format', '{section}_{subsection}_{paragraph}')
+        state = _WalkState(self.config.get('id_format', _DEFAULT_ID_FORMAT))
         
         if algorithm == 'semantic_hierarchical':
-            return self._add_hierarchical_ids(tree, id_format)
-        elif algorithm == 'sequential':
-            return self._add_sequential_ids(tree)
+            tags, handlers = _CONTENT_TAGS, self._hierarchical_handlers
         else:
-            self.logger.warning(f"Unknown ID algorithm: {algorithm}")
-            return self._add_sequential_ids(tree)
-    
-    def _add_hierarchical_ids(self, tree, id_format: str) -> etree._Element:
-        """Add hierarchical paragraph IDs based on document structure."""
-        current_section = "main"
-        current_subsection = "content"
-        paragraph_counter = 1
+            if algorithm != 'sequential':
+                self.logger.warning(f"Unknown ID algorithm: {algorithm}")
+            tags, handlers = _SEQ_TAGS, self._sequential_handlers
         
-        # Find all content elements (headings, paragraphs, lists)
-        content_elements = tree.xpath('//h1 | //h2 | //h3 | //h4 | //h5 | //h6 | //p | //ul | //ol | //li')
-        
-        for element in content_elements:
-            tag = element.tag
-            
-            # Update section based on headings
-            if tag.startswith('h'):
-                level = int(tag[1])
-                heading_text = element.text_content().strip()
-                
-                if level == 1:
-                    current_section = self._normalize_id(heading_text)
-                    current_subsection = "content"
-                    paragraph_counter = 1
-                elif level == 2:
-                    current_subsection = self._normalize_id(heading_text)
-                    paragraph_counter = 1
-                elif level == 3:
-                    current_subsection = self._normalize_id(heading_text)
-                    paragraph_counter = 1
-                
-                # Add ID to heading
-                element.set('id', f"{current_section}_{current_subsection}_heading")
-            
-            # Add ID to paragraphs and list items
-            elif tag in ['p', 'li']:
-                if tag == 'p':
-                    # Generate paragraph ID
-                    paragraph_id = id_format.format(
-                        section=current_section,
-                        subsection=current_subsection,
-                        paragraph=f"p{paragraph_counter}"
-                    )
-                    element.set('id', paragraph_id)
-                    paragraph_counter += 1
-                else:
-                    # Generate list item ID
-                    list_id = f"{current_section}_{current_subsection}_li{paragraph_counter}"
-                    element.set('id', list_id)
-                    paragraph_counter += 1
+        # Iterate lazily: only attributes change, so the walk never needs a materialized list
+        for element in tree.iter(*tags):
+            handlers[element.tag](element, state)
         
         return tree
     
-    def _add_sequential_ids(self, tree) -> etree._Element:
-        """Add sequential paragraph IDs."""
-        counter = 1
-        
-        for element in tree.xpath('//p | //li'):
-            element.set('id', f"paragraph_{counter}")
-            counter += 1
-        
-        return tree
+    def _annotate_heading(self, element, state: "_WalkState") -> None:
+        """Update the current section from a heading and add its ID."""
+        level = _HEADING_LEVELS[element.tag]
+        # Plain-text headings need no descendant walk
+        if len(element) == 0:
+            heading_text = (element.text or '').strip()
+        else:
+            heading_text = element.text_content().strip()
+        
+        if level == 1:
+            state.section = _normalize_id(heading_text)
+            state.subsection = "content"
+            state.counter = 1
+            state.update_prefixes()
+        elif level in (2, 3):
+            state.subsection = _normalize_id(heading_text)
+            state.counter = 1
+            state.update_prefixes()
+        
+        element.attrib['id'] = state.heading_id
     
-    def _normalize_id(self, text: str) -> str:
-        """Normalize text to create valid HTML IDs."""
-        # Convert to lowercase
-        normalized = text.lower()
-        
-        # Replace spaces and special characters with underscores
-        normalized = re.sub(r'[^a-z0-9]+', '_', normalized)
-        
-        # Remove leading/trailing underscores
-        normalized = normalized.strip('_')
-        
-        # Ensure it starts with a letter
-        if normalized and not normalized[0].isalpha():
-            normalized = f"section_{normalized}"
-        
-        return normalized or "section"
+    def _annotate_paragraph(self, element, state: "_WalkState") -> None:
+        """Add a hierarchical paragraph ID."""
+        if state.default_format:
+            paragraph_id = state.p_prefix + str(state.counter)
+        else:
+            paragraph_id = state.id_format.format(
+                section=state.section,
+                subsection=state.subsection,
+                paragraph=f"p{state.counter}"
+            )
+        element.attrib['id'] = paragraph_id
+        state.counter += 1
     
-    def _preserve_headings(self, tree) -> etree._Element:
-        """Ensure headings are preserved and properly structured."""
-        # This is mainly for validation - headings should already be preserved
-        # from the cleaning stage
-        return tree
+    def _annotate_list_item(self, element, state: "_WalkState") -> None:
+        """Add a hierarchical list item ID."""
+        element.attrib['id'] = state.li_prefix + str(state.counter)
+        state.counter += 1
     
-    def _preserve_lists(self, tree) -> etree._Element:
-        """Ensure lists are preserved and properly structured."""
-        # This is mainly for validation - lists should already be preserved
-        # from the cleaning stage
-        return tree 
\ No newline at end of file
+    def _annotate_sequential(self, element, state: "_WalkState") -> None:
+        """Add a sequential paragraph ID."""
+        element.attrib['id'] = f"paragraph_{state.counter}"
+        state.counter += 1
@@ -25,37 +25,305 @@ This app provides:
 import streamlit as st  # Main Streamlit library for web apps
 import json             # For working with JSON data
 import time             # For timestamps and delays
-from pathlib import Path  # Modern way to work with file paths
-from typing import Dict, List, Optional
+from collections import deque
+from pathlib import Path, PurePosixPath  # Modern way to work with file paths
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
 import os
 
-# Import our main RAG system
-from llmrag.chapter_rag import ChapterRAG, list_available_chapters, list_available_chapters_with_titles
-from llmrag.utils.vector_store_manager import VectorStoreManager, print_vector_store_status
+import numpy as np
 
+# The RAG system (llmrag.chapter_rag) is imported inside the functions that use it:
+# it pulls in transformers and torch, which the Settings page never needs.
+from llmrag.utils.vector_store_manager import VectorStoreManager
 
-def get_chapter_size(chapter_path: str) -> str:
+if TYPE_CHECKING:
+    from llmrag.chapter_rag import ChapterRAG
+
+# Root of the local IPCC chapter corpus
+IPCC_ROOT = Path("tests/ipcc")
+
+# Maximum number of chapters shown in the chapter dropdown at once
+MAX_CHAPTER_OPTIONS = 50
+
+# Number of most recent question/answer turns kept (and re-rendered) per session
+MAX_CHAT_HISTORY = 100
+
+# Cosine similarity above which a new question reuses an earlier question's answer
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+
+@st.cache_data
+def cached_chapters_with_titles():
+    """
+    List available chapters with titles, cached across reruns.
+    
+    Streamlit reruns the whole script on every interaction; caching avoids
+    re-walking the corpus and re-parsing every chapter's HTML for its title.
+    The chapter set is fixed while the server runs, so the cache has no expiry;
+    use Streamlit's "Clear cache" menu item after adding chapters.
+    """
+    from llmrag.chapter_rag import list_available_chapters_with_titles
+    return list_available_chapters_with_titles()
+
+
+@st.cache_data
+def cached_chapter_titles_by_path():
+    """
+    Map chapter path to title, built once from the cached chapter listing.
+    """
+    return dict(cached_chapters_with_titles())
+
+
+@st.cache_data(ttl=30)
+def cached_storage_info():
+    """
+    Vector store size and counts for the Settings page, refreshed at most every 30 seconds.
+    
+    Reading these means opening ChromaDB and walking its folder on disk, which
+    should not happen on every click on the Settings page.
+    """
+    return VectorStoreManager().get_storage_info()
+
+
+@st.cache_data(ttl=30)
+def cached_collections():
+    """
+    Vector store collections (name, count, metadata), refreshed at most every 30 seconds.
     """
-    Get the approximate size of a chapter for display.
+    return VectorStoreManager().list_collections()
+
+
+@st.cache_resource
+def get_rag(model_name: str, device: str) -> "ChapterRAG":
+    """
+    Get the shared ChapterRAG instance for a (model, device) pair.
+    
+    STUDENT EXPLANATION:
+    st.cache_resource keeps one object per argument combination for the whole
+    server process, so every session and every rerun reuses the same instance
+    instead of building a new one. Users stay isolated because ChapterRAG keeps
+    a separate pipeline per chapter+user key.
+    """
+    from llmrag.chapter_rag import ChapterRAG
+    return ChapterRAG(model_name=model_name, device=device)
+
+
+def scan_chapter_sizes(root: Path = IPCC_ROOT) -> Dict[str, int]:
+    """
+    Collect the HTML file size of every chapter in one pass over the corpus.
+    
+    STUDENT EXPLANATION:
+    os.scandir lists a directory and tells us which entries are folders
+    without an extra system call per entry, so walking root/<wg>/<chapter>/
+    once is cheaper than checking each chapter's file separately.
     
     Args:
-        chapter_path: Path to the chapter (e.g., "wg1/chapter02")
+        root: Corpus root containing working-group folders
         
     Returns:
-        Human-readable size string (e.g., "1.2 MB", "850 KB")
+        Dict mapping chapter path (e.g., "wg1/chapter02") to size in bytes
     """
-    try:
-        html_file = Path(f"tests/ipcc/{chapter_path}/html_with_ids.html")
-        if html_file.exists():
-            size_bytes = html_file.stat().st_size
-            if size_bytes > 1024 * 1024:
-                return f"{size_bytes / (1024 * 1024):.1f} MB"
-            else:
-                return f"{size_bytes / 1024:.0f} KB"
-        else:
-            return "Unknown"
-    except:
+    sizes = {}
+    if not root.is_dir():
+        return sizes
+    
+    with os.scandir(root) as wg_entries:
+        for wg_entry in wg_entries:
+            if not wg_entry.is_dir():
+                continue
+            with os.scandir(wg_entry.path) as chapter_entries:
+                for chapter_entry in chapter_entries:
+                    if not chapter_entry.is_dir():
+                        continue
+                    html_file = os.path.join(chapter_entry.path, "html_with_ids.html")
+                    if os.path.isfile(html_file):
+                        sizes[f"{wg_entry.name}/{chapter_entry.name}"] = os.path.getsize(html_file)
+    return sizes
+
+
+def format_chapter_size(size_bytes: Optional[int]) -> str:
+    """
+    Format a byte count for display (e.g., "1.2 MB", "850 KB", or "Unknown").
+    """
+    if size_bytes is None:
         return "Unknown"
+    if size_bytes > 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    else:
+        return f"{size_bytes / 1024:.0f} KB"
+
+
+def build_source_previews(context):
+    """
+    Reduce retrieved documents to (preview, paragraph_ids) pairs.
+    
+    Done once when an answer arrives, so rendering never touches the full
+    page_content of the source documents again.
+    
+    Args:
+        context: List of retrieved Document objects
+        
+    Returns:
+        List of (first 200 characters, paragraph IDs string) tuples
+    """
+    return [(doc.page_content[:200], doc.metadata.get('paragraph_ids', '')) for doc in context]
+
+
+def build_sources_markdown(previews, paragraph_ids) -> str:
+    """
+    Build the "View Sources" markdown for one answer.
+    
+    The string is built once when the answer arrives and stored with the message,
+    so replaying the chat history does not re-walk every source document.
+    
+    Args:
+        previews: (preview, paragraph_ids) pairs from build_source_previews()
+        paragraph_ids: Paragraph IDs cited by the answer
+        
+    Returns:
+        Markdown string for the sources expander
+    """
+    lines = []
+    if previews:
+        lines.append("**Context Sources:**")
+        for i, (preview, preview_ids) in enumerate(previews, 1):
+            lines.append(f"{i}. {preview}...")
+            if preview_ids:
+                lines.append(f"   **IDs:** {preview_ids}")
+    
+    if paragraph_ids:
+        lines.append(f"**Source Paragraph IDs:** {paragraph_ids}")
+    
+    return "\n\n".join(lines)
+
+
+def build_history_entry(question, answer, result) -> Dict:
+    """
+    Build the chat history entry for one answered question.
+    
+    Only the short source previews are kept, not the retrieved Document objects,
+    so each entry stays small however long the session runs.
+    
+    Args:
+        question: The question that was asked
+        answer: The generated answer text
+        result: Result dict from the RAG system (context, paragraph_ids, ...)
+        
+    Returns:
+        Dict with the question, answer and prebuilt sources markdown
+    """
+    previews = build_source_previews(result.get('context', []))
+    return {
+        'question': question,
+        'answer': answer,
+        'previews': previews,
+        'paragraph_ids': result.get('paragraph_ids', ''),
+        'chapter': result.get('chapter', ''),
+        'user_id': result.get('user_id', ''),
+        'sources_md': build_sources_markdown(previews, result.get('paragraph_ids', ''))
+    }
+
+
+def unit_vector(embedding) -> np.ndarray:
+    """
+    Convert an embedding to a float32 vector of length 1, so a dot product is a cosine similarity.
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """
+    Earlier questions of one chapter/user, stored column-wise for fast similarity search.
+    
+    STUDENT EXPLANATION:
+    Instead of a list of (embedding, entry) pairs, the embeddings live in one
+    preallocated 2D numpy array (one row per question) and the history entries
+    in a parallel list. Comparing a new question with every earlier one is then
+    a single matrix-vector product, with no stacking of arrays on each lookup.
+    Once the cache is full, the oldest row is overwritten.
+    """
+    
+    def __init__(self, capacity: int = MAX_CHAT_HISTORY):
+        self.capacity = capacity
+        self.embeddings = None  # Allocated on first add, when the dimension is known
+        self.entries = []
+        self.next_slot = 0
+    
+    def add(self, embedding, entry: Dict):
+        """
+        Store a question's embedding and its chat history entry.
+        """
+        vector = unit_vector(embedding)
+        if self.embeddings is None:
+            self.embeddings = np.empty((self.capacity, vector.shape[0]), dtype=np.float32)
+        
+        slot = self.next_slot
+        self.embeddings[slot] = vector
+        if slot < len(self.entries):
+            self.entries[slot] = entry
+        else:
+            self.entries.append(entry)
+        self.next_slot = (slot + 1) % self.capacity
+    
+    def lookup(self, embedding, threshold: float = SEMANTIC_CACHE_THRESHOLD) -> Optional[Dict]:
+        """
+        Return the entry of the most similar earlier question, if it reaches the threshold.
+        """
+        if not self.entries:
+            return None
+        
+        similarities = self.embeddings[:len(self.entries)] @ unit_vector(embedding)
+        best = int(np.argmax(similarities))
+        if similarities[best] >= threshold:
+            return self.entries[best]
+        return None
+
+
+def semantic_cache_lookup(query_embedding, chapter, user) -> Optional[Dict]:
+    """
+    Find an earlier answer to a question that means the same as this one.
+    
+    STUDENT EXPLANATION:
+    Users often re-ask a question in slightly different words ("what is SSP?",
+    "explain SSP"). Their embeddings point in almost the same direction, so we
+    compare the new question's embedding with every cached one in a single
+    matrix-vector product and reuse the best match if it is similar enough.
+    Generating an answer takes seconds; this check takes microseconds.
+    
+    Args:
+        query_embedding: Embedding of the new question
+        chapter, user: The cache is kept separately per chapter and user
+        
+    Returns:
+        The cached chat history entry, or None if nothing is similar enough
+    """
+    cache = st.session_state.semantic_cache.get((chapter, user))
+    if cache is None:
+        return None
+    return cache.lookup(query_embedding)
+
+
+def semantic_cache_store(query_embedding, chapter, user, entry):
+    """
+    Remember an answered question's embedding and history entry for semantic_cache_lookup().
+    """
+    cache = st.session_state.semantic_cache.get((chapter, user))
+    if cache is None:
+        cache = st.session_state.semantic_cache[(chapter, user)] = SemanticCache()
+    cache.add(query_embedding, entry)
+
+
+def render_sources(sources_md: str):
+    """
+    Show an answer's prebuilt sources markdown in a collapsible expander.
+    
+    Shared by the chat history replay and the newly arrived answer, so both
+    render sources identically.
+    """
+    with st.expander("📄 View Sources"):
+        st.markdown(sources_md)
 
 
 def init_session_state():
@@ -81,28 +349,49 @@ def init_session_state():
     if 'current_user' not in st.session_state:
         st.session_state.current_user = None
     if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+        # A bounded deque drops the oldest turn once MAX_CHAT_HISTORY is reached
+        st.session_state.chat_history = deque(maxlen=MAX_CHAT_HISTORY)
+    if 'semantic_cache' not in st.session_state:
+        st.session_state.semantic_cache = {}
     if 'model_name' not in st.session_state:
         st.session_state.model_name = "gpt2-large"
     if 'device' not in st.session_state:
         st.session_state.device = "cpu"
 
 
-def organize_chapters_by_working_group(chapters_with_titles):
+class ChapterEntry(NamedTuple):
+    """
+    One chapter in the chapter menu.
+    
+    STUDENT EXPLANATION:
+    A NamedTuple is a tuple with named fields: it is as small as a tuple but
+    can be read like an object (chapter.title instead of chapter['title']).
+    """
+    path: str
+    title: str
+    truncated_title: str
+    chapter_num: str
+    size: str
+    size_bytes: Optional[int]
+
+
+def organize_chapters_by_working_group(chapters_with_titles, chapter_sizes):
     """
     Organize chapters by working group for better navigation.
     
     Args:
         chapters_with_titles: List of (path, title) tuples
+        chapter_sizes: Dict of chapter path to size in bytes, as returned
+            by scan_chapter_sizes()
         
     Returns:
-        Dict with working groups as keys and lists of chapters as values
+        Dict with working groups as keys and lists of ChapterEntry as values
     """
     organized = {}
     
     for path, title in chapters_with_titles:
         # Extract working group from path (e.g., "wg1" from "wg1/chapter02")
-        parts = path.split('/')
+        parts = PurePosixPath(path.replace('\\', '/')).parts
         if len(parts) >= 2:
             working_group = parts[0]  # e.g., "wg1"
             chapter_num = parts[1]    # e.g., "chapter02"
@@ -113,55 +402,85 @@ def organize_chapters_by_working_group(chapters_with_titles):
             # Truncate title if too long (with tooltip for full title)
             truncated_title = title[:60] + "..." if len(title) > 60 else title
             
-            # Get chapter size
-            chapter_size = get_chapter_size(path)
+            # Get chapter size (bytes for sorting, formatted string for display)
+            size_bytes = chapter_sizes.get(path)
             
-            organized[working_group].append({
-                'path': path,
-                'title': title,
-                'truncated_title': truncated_title,
-                'chapter_num': chapter_num,
-                'size': chapter_size
-            })
-    
-    # Sort chapters within each working group by size (smallest first) then by chapter number
+            organized[working_group].append(ChapterEntry(
+                path=path,
+                title=title,
+                truncated_title=truncated_title,
+                chapter_num=chapter_num,
+                size=format_chapter_size(size_bytes),
+                size_bytes=size_bytes
+            ))
+    
+    # Sort chapters within each working group by size (smallest first, unknown sizes last)
+    # then by chapter number. Sorting on the byte count, not the "1.2 MB" label,
+    # keeps KB-sized chapters ahead of MB-sized ones.
     for wg in organized:
-        organized[wg].sort(key=lambda x: (x['size'], x['chapter_num']))
+        organized[wg].sort(key=lambda x: (x.size_bytes is None, x.size_bytes or 0, x.chapter_num))
     
     return organized
 
 
+@st.cache_data
+def cached_chapter_menu():
+    """
+    Build the cascading chapter menu once per server process.
+    
+    Returns:
+        Dict mapping working group to a (chapters, option_labels) tuple, where
+        option_labels[i] is the selectbox label for chapters[i]
+    """
+    organized = organize_chapters_by_working_group(cached_chapters_with_titles(), scan_chapter_sizes())
+    
+    menu = {}
+    for wg, chapters in organized.items():
+        # Format: "Chapter 02 (850 KB): Truncated Title..."
+        options = [
+            f"Chapter {chapter.chapter_num.replace('chapter', '')} ({chapter.size}): {chapter.truncated_title}"
+            for chapter in chapters
+        ]
+        menu[wg] = (chapters, options)
+    return menu
+
+
+@st.cache_resource
 def get_safe_device():
     """
     Get a safe device setting, defaulting to CPU if GPU is not available.
+    
+    Cached for the whole process: the torch import and hardware probe only
+    need to run once, not on every rerun of the Load page.
     """
     try:
         import torch
-        if torch.cuda.is_available():
-            return "cuda"
-        elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-            # Check macOS version for MPS compatibility
-            import platform
-            if platform.system() == "Darwin":
-                # Parse macOS version
-                version_str = platform.mac_ver()[0]
-                try:
-                    major, minor = map(int, version_str.split('.')[:2])
-                    if major >= 14 or (major == 13 and minor >= 0):
-                        return "mps"
-                except:
-                    pass
-            return "cpu"
-        else:
-            return "cpu"
-    except:
+    except ImportError:
         return "cpu"
+    
+    if torch.cuda.is_available():
+        return "cuda"
+    
+    mps_backend = getattr(torch.backends, 'mps', None)
+    if mps_backend is not None and mps_backend.is_available():
+        # Check macOS version for MPS compatibility (macOS 13 or newer)
+        import platform
+        if platform.system() == "Darwin":
+            major = platform.mac_ver()[0].split('.')[0]
+            if major.isdigit() and int(major) >= 13:
+                return "mps"
+    
+    return "cpu"
 
 
+@st.fragment
 def load_chapter_interface():
     """
     Interface for loading chapters with improved cascading menu.
     
+    Runs as a fragment: changing a picker reruns only this page section, not the
+    sidebar. A successful load still triggers a full app rerun.
+    
     STUDENT EXPLANATION:
     This function creates the web interface for loading chapters. It's like creating
     a form where users can:
@@ -174,15 +493,15 @@ def load_chapter_interface():
     - st.header(): Creates a title
     - st.selectbox(): Creates a dropdown menu
     - st.text_input(): Creates a text field
-    - st.button(): Creates a clickable button
-    - st.spinner(): Shows a loading animation
-    - st.success()/st.error(): Shows success/error messages
+    - st.form(): Groups inputs so they are submitted together with one button
+    - st.status(): Shows a collapsible box listing loading steps as they happen
+    - st.error(): Shows error messages
     """
     st.header("📖 Load IPCC Chapter")
     
     # Get available chapters with titles
     try:
-        chapters_with_titles = list_available_chapters_with_titles()
+        chapters_with_titles = cached_chapters_with_titles()
         if not chapters_with_titles:
             st.error("❌ No chapters found. Make sure you have IPCC chapters in the tests/ipcc directory.")
             return
@@ -190,14 +509,14 @@ def load_chapter_interface():
         st.error(f"❌ Error loading chapters: {e}")
         return
     
-    # Organize chapters by working group
-    organized_chapters = organize_chapters_by_working_group(chapters_with_titles)
+    # Organize chapters by working group (cached, with option labels prebuilt)
+    chapter_menu = cached_chapter_menu()
     
     # Chapter selection with cascading menus
     st.subheader("Select Chapter")
     
     # First level: Working Group selection
-    working_groups = sorted(organized_chapters.keys())
+    working_groups = sorted(chapter_menu.keys())
     selected_wg = st.selectbox(
         "Working Group:",
         working_groups,
@@ -206,97 +525,93 @@ def load_chapter_interface():
     
     if selected_wg:
         # Second level: Chapter selection within working group
-        chapters_in_wg = organized_chapters[selected_wg]
-        
-        # Create options with truncated titles, chapter numbers, and sizes
-        chapter_options = []
-        chapter_paths = []
+        # Options with truncated titles, chapter numbers, and sizes
+        chapters_in_wg, chapter_options = chapter_menu[selected_wg]
         
-        for chapter in chapters_in_wg:
-            # Format: "Chapter 02 (850 KB): Truncated Title..."
-            option_text = f"Chapter {chapter['chapter_num'].replace('chapter', '')} ({chapter['size']}): {chapter['truncated_title']}"
-            chapter_options.append(option_text)
-            chapter_paths.append(chapter['path'])
+        # Only matching chapters (up to MAX_CHAPTER_OPTIONS) are sent to the dropdown
+        filter_text = st.text_input(
+            "Filter chapters:",
+            value="",
+            help="Type part of a chapter title to narrow the list"
+        ).strip().lower()
+        visible = [
+            i for i, chapter in enumerate(chapters_in_wg)
+            if filter_text in chapter.title.lower()
+        ][:MAX_CHAPTER_OPTIONS]
         
         selected_chapter_index = st.selectbox(
             "Chapter:",
-            range(len(chapter_options)),
-            format_func=lambda i: chapter_options[i] if i < len(chapter_options) else "",
+            visible,
+            format_func=lambda i: chapter_options[i],
             help="Select a chapter (hover for full title). Smaller chapters load faster for testing."
         )
         
         # Show full title and size as tooltip/info
-        if selected_chapter_index < len(chapters_in_wg):
+        if selected_chapter_index is not None:
             selected_chapter_info = chapters_in_wg[selected_chapter_index]
-            st.info(f"📖 **Full Title:** {selected_chapter_info['title']}  \n📊 **Size:** {selected_chapter_info['size']}")
-            selected_chapter = selected_chapter_info['path']
+            st.info(f"📖 **Full Title:** {selected_chapter_info.title}  \n📊 **Size:** {selected_chapter_info.size}")
+            selected_chapter = selected_chapter_info.path
         else:
             selected_chapter = None
     else:
         selected_chapter = None
     
-    # User ID input field
-    user_id = st.text_input(
-        "User ID:",
-        value="default",
-        help="Enter a unique identifier for your session"
-    )
-    
-    # Model configuration in two columns (side by side)
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Model selection dropdown
-        model_name = st.selectbox(
-            "Model", 
-            ["gpt2-large", "gpt2-medium", "gpt2", "distilgpt2"], 
-            index=0,
-            help="Select the language model to use for generating answers"
+    # Session settings are batched in a form: changing them does not rerun the
+    # script, only pressing Load does. Chapter selection stays outside so the
+    # full-title info updates as soon as a chapter is picked.
+    with st.form("load_chapter"):
+        # User ID input field
+        user_id = st.text_input(
+            "User ID:",
+            value="default",
+            help="Enter a unique identifier for your session"
         )
-    
-    with col2:
-        # Device selection with smart defaults
-        safe_device = get_safe_device()
-        device_options = ["auto", "cpu", "mps", "cuda"]
         
-        # Set default index based on safe device
-        default_device_index = device_options.index(safe_device) if safe_device in device_options else 1
+        # Model configuration in two columns (side by side)
+        col1, col2 = st.columns(2)
         
-        device = st.selectbox(
-            "Device", 
-            device_options,
-            index=default_device_index,
-            help=f"Select the device to run the model on (auto = best available, current best: {safe_device})"
-        )
+        with col1:
+            # Model selection dropdown
+            model_name = st.selectbox(
+                "Model", 
+                ["gpt2-large", "gpt2-medium", "gpt2", "distilgpt2"], 
+                index=0,
+                help="Select the language model to use for generating answers"
+            )
+        
+        with col2:
+            # Device selection with smart defaults
+            safe_device = get_safe_device()
+            device_options = ["auto", "cpu", "mps", "cuda"]
+            
+            # Set default index based on safe device
+            default_device_index = device_options.index(safe_device) if safe_device in device_options else 1
+            
+            device = st.selectbox(
+                "Device", 
+                device_options,
+                index=default_device_index,
+                help=f"Select the device to run the model on (auto = best available, current best: {safe_device})"
+            )
+        
+        # Load button
+        submitted = st.form_submit_button("🚀 Load Chapter", type="primary")
     
-    # Load button
-    if st.button("🚀 Load Chapter", type="primary"):
+    if submitted:
         if not selected_chapter or not user_id:
             st.error("Please select a chapter and enter a user ID.")
             return
         
-        # Show loading spinner while processing
-        with st.spinner("Loading chapter..."):
+        # Show a status box that lists each real step as it starts
+        with st.status("Loading chapter...", expanded=True) as status:
             try:
-                # Create progress bar for loading
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                # Update progress
-                status_text.text("Initializing RAG system...")
-                progress_bar.progress(10)
-                
-                # Create RAG system and load chapter
-                rag = ChapterRAG(model_name=model_name, device=device)
-                
-                status_text.text("Loading chapter content...")
-                progress_bar.progress(30)
+                # Get the shared RAG system and load chapter
+                st.write("Initializing RAG system...")
+                rag = get_rag(model_name, device)
                 
+                st.write("Loading chapter content...")
                 rag.load_chapter(selected_chapter, user_id)
                 
-                status_text.text("Finalizing setup...")
-                progress_bar.progress(90)
-                
                 # Store in session state (persistent memory)
                 st.session_state.rag_system = rag
                 st.session_state.current_chapter = selected_chapter
@@ -304,82 +619,87 @@ def load_chapter_interface():
                 st.session_state.model_name = model_name
                 st.session_state.device = device
                 
-                progress_bar.progress(100)
-                status_text.text("Complete!")
-                
-                st.success(f"✅ Chapter loaded successfully for user '{user_id}'!")
-                st.rerun()  # Refresh the page to show the chat interface
+                status.update(label=f"✅ Chapter loaded successfully for user '{user_id}'!", state="complete")
+                st.rerun(scope="app")  # Refresh the whole page to show the chat interface
                 
             except Exception as e:
+                status.update(label="❌ Error loading chapter", state="error")
                 st.error(f"❌ Error loading chapter: {e}")
 
 
-def chat_interface():
+def answer_question_batch(questions):
     """
-    Interface for chatting with the loaded chapter.
+    Answer several questions with one batched call to the RAG system.
     
     STUDENT EXPLANATION:
-    This function creates a chat interface similar to ChatGPT or other chat apps.
-    It includes:
-    - Display of chat history (previous questions and answers)
-    - A chat input field for new questions
-    - Expandable sections showing source information
-    - Real-time processing with loading indicators
+    When a user pastes a list of questions, asking the model about each one
+    separately would repeat the same work many times. ask_batch() lets the model
+    answer them together; we then show each question and answer as its own pair
+    of chat bubbles.
     
-    Streamlit components used:
-    - st.chat_message(): Creates chat bubbles
-    - st.chat_input(): Creates a chat input field
-    - st.expander(): Creates collapsible sections
-    - st.write(): Displays text content
+    Args:
+        questions: Non-empty question strings
     """
-    if not st.session_state.rag_system:
-        st.warning("⚠️ Please load a chapter first.")
-        return
-    
-    # Get chapter title for display
-    try:
-        chapters_with_titles = list_available_chapters_with_titles()
-        chapter_title = None
-        for path, title in chapters_with_titles:
-            if path == st.session_state.current_chapter:
-                chapter_title = title
-                break
-    except:
-        chapter_title = st.session_state.current_chapter
-    
-    # Display chapter information
-    if chapter_title:
-        st.header(f"💬 Chat with: {chapter_title}")
-        st.caption(f"Chapter: {st.session_state.current_chapter}")
-    else:
-        st.header(f"💬 Chat with {st.session_state.current_chapter}")
+    with st.spinner(f"🤖 Answering {len(questions)} questions..."):
+        try:
+            results = st.session_state.rag_system.ask_batch(
+                questions,
+                st.session_state.current_chapter,
+                st.session_state.current_user
+            )
+        except Exception as e:
+            st.error(f"❌ Error: {e}")
+            return
     
-    st.info(f"👤 User: {st.session_state.current_user} | 🤖 Model: {st.session_state.model_name} | 💻 Device: {st.session_state.device}")
+    for question, result in zip(questions, results):
+        with st.chat_message("user"):
+            st.write(question)
+        
+        with st.chat_message("assistant"):
+            st.write(result['answer'])
+            entry = build_history_entry(question, result['answer'], result)
+            st.session_state.chat_history.append(entry)
+            render_sources(entry['sources_md'])
+
+
+@st.fragment
+def chat_fragment():
+    """
+    Chat history and question input, rerun on their own.
     
+    STUDENT EXPLANATION:
+    @st.fragment marks a piece of the page that can rerun by itself. Sending a
+    question only reruns this function, not the sidebar, the page header or
+    the session setup at the top of the script.
+    """
     # Display chat history
-    for i, (question, answer, metadata) in enumerate(st.session_state.chat_history):
+    for entry in st.session_state.chat_history:
         # User message bubble
         with st.chat_message("user"):
-            st.write(question)
+            st.write(entry['question'])
         
         # Assistant message bubble
         with st.chat_message("assistant"):
-            st.write(answer)
+            st.write(entry['answer'])
             
-            # Show metadata in expander (collapsible section)
-            with st.expander("📄 View Sources"):
-                if metadata.get('context'):
-                    st.write("**Context Sources:**")
-                    for j, doc in enumerate(metadata['context'], 1):
-                        st.write(f"{j}. {doc.page_content[:200]}...")
-                        if doc.metadata.get('paragraph_ids'):
-                            st.write(f"   **IDs:** {doc.metadata['paragraph_ids']}")
-                
-                if metadata.get('paragraph_ids'):
-                    st.write(f"**Source Paragraph IDs:** {metadata['paragraph_ids']}")
+            # Show metadata in expander (collapsible section), prebuilt when the answer arrived
+            render_sources(entry['sources_md'])
+    
+    # Batch mode is opt-in, so one question typed over two lines stays one question
+    batch_mode = st.toggle(
+        "📋 Batch mode",
+        key="batch_mode",
+        help="Treat each line of your message as a separate question and answer them together"
+    )
     
     # Chat input field
     if prompt := st.chat_input("Ask a question about the chapter..."):
+        # In batch mode, several questions on separate lines are answered in one batch
+        questions = [line.strip() for line in prompt.splitlines() if line.strip()] if batch_mode else [prompt]
+        if len(questions) > 1:
+            answer_question_batch(questions)
+            return
+        
         # Add user message to chat
         with st.chat_message("user"):
             st.write(prompt)
@@ -396,46 +716,94 @@ def chat_interface():
                     status_text.text("Searching for relevant content...")
                     progress_bar.progress(25)
                     
-                    # Ask the question
-                    result = st.session_state.rag_system.ask(
-                        prompt, 
-                        st.session_state.current_chapter, 
+                    # A question that means the same as an earlier one reuses its answer
+                    query_embedding = st.session_state.rag_system.embed_query(
+                        prompt,
+                        st.session_state.current_chapter,
+                        st.session_state.current_user
+                    )
+                    cached_entry = semantic_cache_lookup(
+                        query_embedding,
+                        st.session_state.current_chapter,
                         st.session_state.current_user
                     )
                     
-                    status_text.text("Generating answer...")
-                    progress_bar.progress(75)
-                    
-                    st.write(result['answer'])
+                    if cached_entry is not None:
+                        st.write(cached_entry['answer'])
+                        st.caption("♻️ Reused the answer to a very similar earlier question")
+                        entry = dict(cached_entry, question=prompt)
+                    else:
+                        # Ask the question; retrieval happens here, generation is streamed below
+                        result = st.session_state.rag_system.ask_stream(
+                            prompt, 
+                            st.session_state.current_chapter, 
+                            st.session_state.current_user
+                        )
+                        
+                        status_text.text("Generating answer...")
+                        progress_bar.progress(75)
+                        
+                        # Show the answer word by word as the model produces it
+                        answer = st.write_stream(result['answer_stream'])
+                        
+                        # Build the history entry, with the sources markdown rendered once here
+                        entry = build_history_entry(prompt, answer, result)
+                        semantic_cache_store(
+                            query_embedding,
+                            st.session_state.current_chapter,
+                            st.session_state.current_user,
+                            entry
+                        )
                     
                     status_text.text("Complete!")
                     progress_bar.progress(100)
                     
-                    # Store in chat history
-                    metadata = {
-                        'context': result.get('context', []),
-                        'paragraph_ids': result.get('paragraph_ids', ''),
-                        'chapter': result.get('chapter', ''),
-                        'user_id': result.get('user_id', '')
-                    }
-                    st.session_state.chat_history.append((prompt, result['answer'], metadata))
+                    st.session_state.chat_history.append(entry)
                     
                     # Show sources in expander
-                    with st.expander("📄 View Sources"):
-                        if result.get('context'):
-                            st.write("**Context Sources:**")
-                            for i, doc in enumerate(result['context'], 1):
-                                st.write(f"{i}. {doc.page_content[:200]}...")
-                                if doc.metadata.get('paragraph_ids'):
-                                    st.write(f"   **IDs:** {doc.metadata['paragraph_ids']}")
-                        
-                        if result.get('paragraph_ids'):
-                            st.write(f"**Source Paragraph IDs:** {result['paragraph_ids']}")
+                    render_sources(entry['sources_md'])
                     
                 except Exception as e:
                     st.error(f"❌ Error: {e}")
 
 
+def chat_interface():
+    """
+    Interface for chatting with the loaded chapter.
+    
+    STUDENT EXPLANATION:
+    This function creates a chat interface similar to ChatGPT or other chat apps.
+    It includes:
+    - Display of chat history (previous questions and answers)
+    - A chat input field for new questions
+    - Expandable sections showing source information
+    - Real-time processing with loading indicators
+    
+    Streamlit components used:
+    - st.chat_message(): Creates chat bubbles
+    - st.chat_input(): Creates a chat input field
+    - st.expander(): Creates collapsible sections
+    - st.write(): Displays text content
+    """
+    if not st.session_state.rag_system:
+        st.warning("⚠️ Please load a chapter first.")
+        return
+    
+    # Get chapter title for display (None falls back to the chapter path below)
+    chapter_title = cached_chapter_titles_by_path().get(st.session_state.current_chapter)
+    
+    # Display chapter information
+    if chapter_title:
+        st.header(f"💬 Chat with: {chapter_title}")
+        st.caption(f"Chapter: {st.session_state.current_chapter}")
+    else:
+        st.header(f"💬 Chat with {st.session_state.current_chapter}")
+    
+    st.info(f"👤 User: {st.session_state.current_user} | 🤖 Model: {st.session_state.model_name} | 💻 Device: {st.session_state.device}")
+    
+    # Messages and input rerun on their own, without the rest of the page
+    chat_fragment()
+
 def settings_interface():
     """
     Interface for settings and system information.
@@ -465,8 +833,7 @@ def settings_interface():
     # Vector Store Management
     st.subheader("📚 Vector Store Management")
     
-    manager = VectorStoreManager()
-    storage_info = manager.get_storage_info()
+    storage_info = cached_storage_info()
     
     if storage_info["exists"]:
         col1, col2, col3 = st.columns(3)
@@ -478,7 +845,7 @@ def settings_interface():
             st.metric("Total Documents", storage_info['total_documents'])
         
         # Show collections
-        collections = manager.list_collections()
+        collections = cached_collections()
         if collections:
             st.write("**Cached Collections:**")
             for coll in collections:
@@ -487,10 +854,14 @@ def settings_interface():
             # Cleanup options
             st.write("**Storage Management:**")
             if st.button("🗑️ Clear All Cached Data", type="secondary"):
+                manager = VectorStoreManager()
                 deleted_count = 0
                 for coll in collections:
                     if manager.delete_collection(coll['name']):
                         deleted_count += 1
+                # The cached figures are stale now
+                cached_storage_info.clear()
+                cached_collections.clear()
                 st.success(f"Deleted {deleted_count} collections")
                 st.rerun()
         else:
@@ -510,7 +881,7 @@ def settings_interface():
     
     with col2:
         if st.button("🗑️ Clear Chat History", type="secondary"):
-            st.session_state.chat_history = []
+            st.session_state.chat_history = deque(maxlen=MAX_CHAT_HISTORY)
             st.success("Chat history cleared!")
             st.rerun()
     
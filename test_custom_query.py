@@ -5,7 +5,7 @@ Interactive test script for custom queries using the RAG pipeline.
 
 import os
 from llmrag.ingestion.ingest_html import ingest_html_file
-from llmrag.embeddings import SentenceTransformersEmbedder
+from llmrag.embeddings.sentence_transformers_embedder import SentenceTransformersEmbedder
 from llmrag.retrievers import ChromaVectorStore
 from llmrag.models.fake_llm import FakeLLM
 from llmrag.pipelines.rag_pipeline import RAGPipeline
@@ -5,16 +5,22 @@ Test script to demonstrate the performance and quality improvements.
 
 import time
 import os
+from functools import lru_cache
 from llmrag.chapter_rag import ChapterRAG
 from llmrag.utils.vector_store_manager import VectorStoreManager
 
+@lru_cache(maxsize=None)
+def get_rag(model_name):
+    """One shared ChapterRAG per model, so each model is loaded only once per run."""
+    return ChapterRAG(model_name=model_name, device="cpu")
+
 def test_caching_performance():
     """Test the caching performance improvements."""
     print("🚀 Testing Caching Performance")
     print("=" * 50)
     
     # Initialize RAG system
-    rag = ChapterRAG(model_name="gpt2-medium", device="cpu")
+    rag = get_rag("gpt2-medium")
     
     # Test chapter
     chapter_name = "wg1/chapter04"
@@ -26,18 +32,18 @@ def test_caching_performance():
     
     # First load (should be slow)
     print("🔄 First load (should process and cache)...")
-    start_time = time.time()
+    start_time = time.perf_counter()
     rag.load_chapter(chapter_name, user_id)
-    first_load_time = time.time() - start_time
-    print(f"⏱️  First load time: {first_load_time:.2f} seconds")
+    first_load_time = time.perf_counter() - start_time
+    print(f"⏱️  First load time: {first_load_time:.2f}s")
     print()
     
     # Second load (should be fast due to caching)
     print("🔄 Second load (should use cache)...")
-    start_time = time.time()
+    start_time = time.perf_counter()
     rag.load_chapter(chapter_name, user_id)
-    second_load_time = time.time() - start_time
-    print(f"⏱️  Second load time: {second_load_time:.2f} seconds")
+    second_load_time = time.perf_counter() - start_time
+    print(f"⏱️  Second load time: {second_load_time:.4f}s")  # cached, so well under a second
     print()
     
     # Calculate improvement
@@ -52,9 +58,11 @@ def test_answer_quality():
     print("\n🎯 Testing Answer Quality")
     print("=" * 50)
     
-    rag = ChapterRAG(model_name="gpt2-large", device="cpu")
+    rag = get_rag("gpt2-large")
     chapter_name = "wg1/chapter04"
-    user_id = "quality_test"
+    # Same user as test_caching_performance, so the chapter indexed there is reused
+    # (indexing does not depend on the language model)
+    user_id = "test_user"
     
     # Load chapter
     rag.load_chapter(chapter_name, user_id)
@@ -71,9 +79,9 @@ def test_answer_quality():
         print(f"\n❓ Question {i}: {question}")
         print("-" * 40)
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = rag.ask(question, chapter_name, user_id)
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
         
         print(f"🤖 Answer ({response_time:.2f}s):")
         print(result['answer'])
@@ -5,7 +5,7 @@ Test script for ingesting IPCC HTML content with paragraph IDs and testing RAG p
 
 import os
 from llmrag.ingestion.ingest_html import ingest_html_file
-from llmrag.embeddings import SentenceTransformersEmbedder
+from llmrag.embeddings import load_embedder
 from llmrag.retrievers import ChromaVectorStore
 from llmrag.models.fake_llm import FakeLLM
 from llmrag.pipelines.rag_pipeline import RAGPipeline
@@ -28,7 +28,9 @@ def test_ipcc_ingestion():
     
     # Step 1: Ingest the HTML file
     try:
-        ingest_html_file(html_file, collection_name=collection_name)
+        # Set LLMRAG_EMBEDDER=onnx to embed with ONNX Runtime instead of torch
+        embedder = load_embedder({})
+        ingest_html_file(html_file, collection_name=collection_name, embedder=embedder)
         print("✅ HTML ingestion completed successfully")
     except Exception as e:
         print(f"❌ HTML ingestion failed: {e}")
@@ -36,7 +38,6 @@ def test_ipcc_ingestion():
     
     # Step 2: Set up RAG pipeline
     try:
-        embedder = SentenceTransformersEmbedder()
         retriever = ChromaVectorStore(embedder=embedder, collection_name=collection_name)
         llm = FakeLLM()
         pipeline = RAGPipeline(vector_store=retriever, model=llm)
@@ -57,37 +58,31 @@ def test_ipcc_ingestion():
     print("TESTING QUERIES")
     print("=" * 50)
     
-    for i, query in enumerate(test_queries, 1):
+    # Embed all queries in one batch, then retrieve and answer each one
+    try:
+        results = pipeline.run_batch(test_queries)
+    except Exception as e:
+        print(f"❌ Queries failed: {e}")
+        return
+    
+    for i, (query, result) in enumerate(zip(test_queries, results), 1):
         print(f"\nQuery {i}: {query}")
         print("-" * 30)
         
-        try:
-            result = pipeline.run(query)
-            
-            print(f"Answer: {result['answer']}")
-            print(f"Number of context documents: {len(result['context'])}")
-            
-            # Check if any documents have paragraph IDs in metadata
-            paragraph_ids = []
-            for doc in result['context']:
-                if hasattr(doc, 'metadata') and doc.metadata:
-                    # Look for paragraph ID in metadata
-                    for key, value in doc.metadata.items():
-                        if 'id' in key.lower() or 'paragraph' in key.lower():
-                            paragraph_ids.append(value)
-                        elif isinstance(value, str) and ('_p' in value or 'paragraph' in value.lower()):
-                            paragraph_ids.append(value)
-            
-            if paragraph_ids:
-                print(f"Paragraph IDs found: {paragraph_ids}")
-            else:
-                print("No paragraph IDs found in context documents")
-                # Let's check what metadata is actually available
-                if result['context']:
-                    print(f"Available metadata keys: {list(result['context'][0].metadata.keys())}")
-            
-        except Exception as e:
-            print(f"❌ Query failed: {e}")
+        print(f"Answer: {result['answer']}")
+        print(f"Number of context documents: {len(result['context'])}")
+        
+        # The pipeline already collects paragraph IDs from the "paragraph_ids"
+        # metadata key that ingest_html_file() writes
+        paragraph_ids = result['paragraph_ids']
+        
+        if paragraph_ids:
+            print(f"Paragraph IDs found: {paragraph_ids}")
+        else:
+            print("No paragraph IDs found in context documents")
+            # Let's check what metadata is actually available
+            if result['context']:
+                print(f"Available metadata keys: {list(result['context'][0].metadata.keys())}")
 
 if __name__ == "__main__":
     test_ipcc_ingestion() 
\ No newline at end of file
@@ -46,8 +46,12 @@ def test_pipeline():
     # Write test config to file
     config_path = Path('test_config.yaml')
     import yaml
+    try:
+        from yaml import CSafeDumper as _Dumper
+    except ImportError:
+        from yaml import SafeDumper as _Dumper
     with open(config_path, 'w') as f:
-        yaml.dump(test_config, f)
+        yaml.dump(test_config, f, Dumper=_Dumper)
     
     # Create test HTML content
     test_html = """
@@ -40,8 +40,8 @@ def test_simple_usage():
             "What is the projected temperature increase?"
         ]
         
-        for question in questions:
-            result = rag.ask(question, "wg1/chapter04", "test_user2")
+        results = rag.ask_batch(questions, "wg1/chapter04", "test_user2")
+        for question, result in zip(questions, results):
             print(f"   ❓ {question}")
             print(f"   📝 {result['answer'][:80]}...")
             print()
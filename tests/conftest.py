@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+
+from llmrag.embeddings import load_embedder
+
+EMBEDDER_CONFIG = {"model_name": "all-MiniLM-L6-v2", "device": "cpu"}
+
+# Filled in by the warm-up thread started in pytest_collection_modifyitems
+_preloaded = {}
+_preload_thread = None
+
+
+def _preload_embedder():
+    try:
+        _preloaded["embedder"] = load_embedder(EMBEDDER_CONFIG)
+    except Exception as e:
+        # Re-raised by the fixture, so the failure shows up on the tests that need it
+        _preloaded["error"] = e
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    """Start loading the embedder in the background if a selected test needs it."""
+    global _preload_thread
+    # trylast: runs after -m/-k deselection, so e.g. -m "not slow" never loads the model
+    if not any("shared_embedder" in getattr(item, "fixturenames", ()) for item in items):
+        return
+    _preload_thread = threading.Thread(target=_preload_embedder, daemon=True)
+    _preload_thread.start()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # Don't let interpreter shutdown race a half-loaded model
+    if _preload_thread is not None:
+        _preload_thread.join()
+
+
+@pytest.fixture(scope="session")
+def shared_embedder():
+    """One embedder for the whole test run; loading the model dominates these tests."""
+    if _preload_thread is None:
+        return load_embedder(EMBEDDER_CONFIG)
+    _preload_thread.join()
+    if "error" in _preloaded:
+        raise _preloaded["error"]
+    return _preloaded["embedder"]
@@ -44,3 +44,25 @@ def test_no_chunking_if_short():
     assert chunks[0].page_content == short_text
     assert chunks[0].metadata["id"] == "short-001"
     assert "chunk" not in chunks[0].metadata
+
+
+@pytest.mark.parametrize("text_len,chunk_size,overlap", [
+    (20, 5, 0),
+    (20, 5, 4),
+    (1000, 100, 20),
+    (1001, 7, 3),
+    (4, 10, 2),
+])
+def test_chunk_windows_overlap(text_len, chunk_size, overlap):
+    """Test that every chunk is the window starting one step after the previous one and the windows cover the text."""
+    text = "".join(chr(ord("a") + i % 26) for i in range(text_len))
+    chunks = split_documents(text, chunk_size=chunk_size, overlap=overlap)
+    step = chunk_size - overlap
+
+    assert len(chunks) == -(-text_len // step)
+    for i, chunk in enumerate(chunks):
+        assert chunk.page_content == text[i * step:i * step + chunk_size]
+        assert chunk.metadata["chunk_index"] == i
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert prev.page_content[step:] == nxt.page_content[:len(prev.page_content) - step]
+    assert chunks[-1].page_content == text[(len(chunks) - 1) * step:]
@@ -1,6 +1,8 @@
 import unittest
+import pytest
 from llmrag.embeddings import load_embedder
 
+@pytest.mark.slow
 class TestEmbedder(unittest.TestCase):
     def test_embedding_shape(self):
         embedder = load_embedder({"model_name": "all-MiniLM-L6-v2", "device": "cpu"})
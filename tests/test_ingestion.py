@@ -1,8 +1,9 @@
 import os
 import pytest
+from lxml import html
 
-from llmrag.embeddings import SentenceTransformersEmbedder
-from llmrag.ingestion.ingest_html import ingest_html_file
+from llmrag.embeddings import HashEmbedder
+from llmrag.ingestion.ingest_html import ingest_html_file, ingest_html_tree
 from llmrag.retrievers.chroma_store import ChromaVectorStore
 
 TEST_HTML = """<html>
@@ -16,22 +17,28 @@ TEST_HTML = """<html>
     </body>
 </html>"""
 
-@pytest.fixture
-def temp_html_file(tmp_path):
-    html_path = tmp_path / "sample.html"
-    html_path.write_text(TEST_HTML, encoding="utf-8")
-    return str(html_path)
-
+# Parsed once for the tests that skip the file round trip
+PARSED_HTML = html.fromstring(TEST_HTML)
 
-def test_ingest_html_file(temp_html_file):
+@pytest.fixture(scope="module")
+def ingested_collection(tmp_path_factory, shared_embedder):
+    """Ingest TEST_HTML once and share the collection (name, path) between the tests in this module."""
+    html_path = tmp_path_factory.mktemp("html") / "sample.html"
+    html_path.write_text(TEST_HTML, encoding="utf-8")
+    chroma_path = tmp_path_factory.mktemp("chroma")
     collection_name = "test_html_ingestion"
 
-    # Run ingestion
-    ingest_html_file(temp_html_file, collection_name=collection_name)
+    # Run ingestion into a throwaway store; pytest removes tmp dirs itself
+    ingest_html_file(str(html_path), collection_name=collection_name, embedder=shared_embedder,
+                     persist_path=chroma_path)
+    return collection_name, chroma_path
 
+
+@pytest.mark.slow
+def test_ingest_html_file(ingested_collection, shared_embedder):
+    collection_name, chroma_path = ingested_collection
     # Check that documents exist in vector store
-    embedder = SentenceTransformersEmbedder()
-    store = ChromaVectorStore(embedder=embedder, collection_name=collection_name)
+    store = ChromaVectorStore(embedder=shared_embedder, collection_name=collection_name, persist_path=chroma_path)
     results = store.similarity_search("What are future climate projections?", top_k=3)
 
     assert isinstance(results, list)
@@ -40,3 +47,32 @@ def test_ingest_html_file(temp_html_file):
     assert any("Models suggest" in r.page_content for r in results)
 
     # Cleanup: optionally remove the collection (if your ChromaVectorStore supports it)
+
+
+def test_ingest_html_tree(tmp_path):
+    # Hash vectors only match identical text, which is all this test queries with
+    n_chunks = ingest_html_tree(PARSED_HTML, collection_name="test_html_tree",
+                                embedder=HashEmbedder(), persist_path=tmp_path)
+    store = ChromaVectorStore(embedder=HashEmbedder(), collection_name="test_html_tree", persist_path=tmp_path)
+
+    assert n_chunks > 0
+    assert store.collection.count() == n_chunks
+    # Stored vectors and query vectors come from the same embedder, so a chunk finds itself
+    for chunk in store.collection.get()["documents"]:
+        assert store.retrieve(chunk, top_k=1)[0].page_content == chunk
+
+
+def test_ingest_html_file_keeps_other_sources(tmp_path):
+    # Two files sharing one collection: re-ingesting one must not drop the other
+    first, second = tmp_path / "first.html", tmp_path / "second.html"
+    first.write_text(TEST_HTML, encoding="utf-8")
+    second.write_text(TEST_HTML.replace("Climate Change", "Sea Level Rise"), encoding="utf-8")
+    chroma_path = tmp_path / "chroma"
+    for path in (first, second, first):
+        ingest_html_file(str(path), collection_name="test_shared", embedder=HashEmbedder(),
+                         persist_path=chroma_path, force_reingest=True)
+    store = ChromaVectorStore(embedder=HashEmbedder(), collection_name="test_shared", persist_path=chroma_path)
+
+    sources = {meta["source"] for meta in store.collection.get()["metadatas"]}
+    assert sources == {str(first), str(second)}
+    assert store.collection.count() == 2 * len(store.collection.get(where={"source": str(first)})["ids"])
@@ -0,0 +1,24 @@
+import unittest
+import pytest
+from llmrag.models.transformers_model import TransformersModel
+
+@pytest.mark.slow
+class TestTransformersModel(unittest.TestCase):
+    def test_generate_batch_matches_generate(self):
+        model = TransformersModel(model_name="gpt2")
+        lm, _ = model._model_and_tokenizer()
+        sample = lm.generate
+
+        def greedy(**kwargs):
+            # Sampling is random, so compare greedy decodes of the same prompts
+            for key in ("temperature", "top_p", "repetition_penalty"):
+                kwargs.pop(key, None)
+            return sample(**{**kwargs, "do_sample": False, "max_new_tokens": 10})
+
+        lm.generate = greedy
+        try:
+            # Different lengths, so the batch needs padding
+            prompts = ["The capital of France is", "Sea levels are rising because the oceans"]
+            self.assertEqual(model.generate_batch(prompts), [model.generate(prompt) for prompt in prompts])
+        finally:
+            del lm.generate
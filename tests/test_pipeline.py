@@ -1,20 +1,28 @@
 import unittest
+import pytest
 import yaml
 import os
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 from langchain_core.documents import Document
 
-from llmrag.embeddings import load_embedder
+from llmrag.embeddings import HashEmbedder, load_embedder
 from llmrag.models import load_model
 from llmrag.retrievers import load_vector_store
+from llmrag.retrievers.chroma_store import ChromaVectorStore
 from llmrag.pipelines import RAGPipeline
 
+@pytest.mark.slow
 class TestRAGPipeline(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         config_path = os.path.join(os.path.dirname(__file__), "data", "test_docs.yaml")
         with open(config_path, "r") as f:
-            cls.test_config = yaml.safe_load(f)
+            cls.test_config = yaml.load(f, Loader=_Loader)
 
         # Use a mock model for more reliable testing
         cls.model = load_model("fake_llm")  # Use mock model instead of real one
@@ -63,5 +71,28 @@ class TestRAGPipeline(unittest.TestCase):
         self.assertIsNotNone(self.pipeline.vector_store)
 
 
+def test_run_batch_retrieves_same_chunks_as_run():
+    # Hash vectors are enough: both paths only need to agree with each other
+    store = ChromaVectorStore(HashEmbedder(), persist=False)
+    store.add_texts([
+        "Glaciers are retreating as temperatures rise.",
+        "Sea levels are rising due to thermal expansion.",
+        "Heatwaves are becoming more frequent.",
+        "Coral reefs are bleaching in warmer oceans.",
+        "Arctic sea ice is shrinking each summer.",
+    ])
+    pipeline = RAGPipeline(model=load_model("fake_llm"), vector_store=store)
+    queries = ["Why are glaciers retreating?", "What happens to coral reefs?"]
+    try:
+        single = pipeline.run_batch(queries[:1], top_k=2)[0]
+        assert [doc.page_content for doc in single["context"]] == \
+            [doc.page_content for doc in pipeline.run(queries[0], top_k=2)["context"]]
+        for query, result in zip(queries, pipeline.run_batch(queries, top_k=2)):
+            assert [doc.page_content for doc in result["context"]] == \
+                [doc.page_content for doc in pipeline.run(query, top_k=2)["context"]]
+    finally:
+        store.cleanup()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import pytest
 import os
 import sys
 
@@ -6,13 +7,23 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from llmrag.chunking.html_splitter import HtmlTextSplitter
-from llmrag.embeddings.sentence_transformers_embedder import SentenceTransformersEmbedder
+from llmrag.embeddings import HashEmbedder
 from llmrag.models.fake_llm import FakeLLM
 from llmrag.retrievers.chroma_store import ChromaVectorStore
 
 class TestSmoke(unittest.TestCase):
     """Basic smoke tests to ensure core components work."""
 
+    @pytest.fixture(scope="class")
+    @classmethod
+    def class_embedder(cls, request):
+        """Set cls.embedder to the session's shared embedder, skipping if it cannot be loaded."""
+        try:
+            cls.embedder = request.getfixturevalue("shared_embedder")
+        except Exception as e:
+            # e.g. no internet to download the model
+            pytest.skip(f"Embedding test skipped: {e}")
+
     def test_html_splitter(self):
         """Test that HTML splitter works with basic HTML."""
         splitter = HtmlTextSplitter(chunk_size=100)
@@ -23,10 +34,12 @@ class TestSmoke(unittest.TestCase):
         self.assertTrue(len(chunks) > 0)
         self.assertIsInstance(chunks[0].page_content, str)
 
+    @pytest.mark.slow
+    @pytest.mark.usefixtures("class_embedder")
     def test_embedder(self):
         """Test that embedder can create embeddings."""
         try:
-            embedder = SentenceTransformersEmbedder()
+            embedder = self.embedder
             text = "This is a test sentence."
             embedding = embedder.embed(text)
             
@@ -48,11 +61,14 @@ class TestSmoke(unittest.TestCase):
     def test_vector_store_creation(self):
         """Test that vector store can be created."""
         try:
-            embedder = SentenceTransformersEmbedder()
-            store = ChromaVectorStore(embedder, collection_name="test_collection")
+            # Only needs vectors of the right shape, not a real model
+            embedder = HashEmbedder()
+            # In-memory: no shared ./chroma_db between test processes
+            store = ChromaVectorStore(embedder, collection_name="test_collection", persist=False)
             
             self.assertIsNotNone(store)
             self.assertIsNotNone(store.embedder)
+            store.cleanup()
         except Exception as e:
             # If vector store creation fails, just skip this test
             self.skipTest(f"Vector store test skipped: {e}")
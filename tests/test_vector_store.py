@@ -1,10 +1,13 @@
-import shutil
 import unittest
+import pytest
 import yaml
-from llmrag.embeddings import load_embedder, SentenceTransformersEmbedder
+from llmrag.embeddings import HashEmbedder, load_embedder
 from llmrag.retrievers.chroma_store import ChromaVectorStore
-from llmrag.retrievers import load_vector_store
 
+# A handful of documents needs only a small HNSW graph
+TINY_HNSW = {"M": 8, "construction_ef": 32, "search_ef": 10}
+
+@pytest.mark.slow
 class TestChromaStore(unittest.TestCase):
     @classmethod
     def setUpClassOld(cls):
@@ -15,28 +18,35 @@ class TestChromaStore(unittest.TestCase):
         cls.store = ChromaVectorStore(cls.embedder)
         cls.store.add_documents(cls.docs)
 
+    @pytest.fixture(scope="class", autouse=True)
     @classmethod
-    def setUpClass(cls):
-        cls.embedder = SentenceTransformersEmbedder()
-        cls.store = load_vector_store(
-            config={"type": "chroma"},
-            embedder=cls.embedder,
-            persist=False,
-            collection_name="test_collection"
-        )
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.store.client.delete_collection("test_collection")
-
-    def setUp(self):
-        self.embedder = SentenceTransformersEmbedder("all-MiniLM-L6-v2")
-        self.store = ChromaVectorStore(self.embedder, "test_store")
-        self.docs = ["Paris is the capital of France."]
-        self.store.add_texts(self.docs)
-
-    def tearDown(self):
-        shutil.rmtree("chroma/test_store", ignore_errors=True)
+    def class_store(cls, shared_embedder):
+        # The session-wide embedder from conftest.py (LLMRAG_EMBEDDER=onnx still applies)
+        cls.embedder = shared_embedder
+        # The tests only query, so one store ingested once serves all of them
+        cls.store = ChromaVectorStore(cls.embedder, "test_store", persist=False, hnsw_config=TINY_HNSW)
+        cls.docs = [
+            "Paris is the capital of France.",
+            "Berlin is the capital of Germany.",
+            "Madrid is the capital of Spain.",
+            "Rome is the capital of Italy.",
+            "Lisbon is the capital of Portugal.",
+            "Vienna is the capital of Austria.",
+            "Warsaw is the capital of Poland.",
+            "Athens is the capital of Greece.",
+            "Oslo is the capital of Norway.",
+            "Dublin is the capital of Ireland.",
+            "Glaciers are retreating as temperatures rise.",
+            "Sea levels are rising due to thermal expansion.",
+            "Heatwaves are becoming more frequent.",
+            "Coral reefs are bleaching in warmer oceans.",
+            "Arctic sea ice is shrinking each summer.",
+            "Permafrost thaw releases methane.",
+        ]
+        # One batched embedding call for the whole corpus
+        cls.store.add_texts(cls.docs)
+        yield
+        cls.store.cleanup()
 
     def test_retrieve(self):
         query = "What is the capital of France?"
@@ -59,6 +69,22 @@ class TestChromaStore(unittest.TestCase):
         results = self.store.search(query_embedding)
         print("Retrieved:", results)
         self.assertTrue(len(results) > 0)
-        # for tuple in results:
-        #     print(f"{len(tuple)}:: {tuple[0]}, {tuple[1]}")
-        self.assertTrue(any("Paris" in tuple[0] for tuple in results))
+        # for text, score in results:
+        #     print(f"{text}, {score}")
+        self.assertTrue(any("Paris" in text for text, _score in results))
+
+
+class TestInMemoryStores(unittest.TestCase):
+    def test_same_name_stores_are_isolated(self):
+        # Hash vectors are enough: this only checks which collection holds what
+        embedder = HashEmbedder()
+        first = ChromaVectorStore(embedder, persist=False)
+        first.add_texts(["Paris is the capital of France."])
+        second = ChromaVectorStore(embedder, persist=False)
+        second.add_texts(["Berlin is the capital of Germany.", "Madrid is the capital of Spain."])
+        second.cleanup()
+
+        self.assertEqual(first.collection.count(), 1)
+        # The unique suffix stays internal; callers still see the name they passed
+        self.assertEqual(first.collection_name, "rag_collection")
+        first.cleanup()